@@ -32,6 +32,7 @@ from sqlalchemy import text
 
 from .database import Database, get_db
 from .phases import assign_phases_for_cohort
+from .stats import clear_stats_cache
 
 
 @dataclass
@@ -277,6 +278,10 @@ def backfill_phases(
             )
         ).scalar() or 0
 
+    # test_phase changed behind the ORM's back; drop memoized summaries
+    if stats.pellet_rows_updated and not dry_run:
+        clear_stats_cache()
+
     return stats
 
 
@@ -14,6 +14,7 @@ from sqlalchemy.orm import sessionmaker, Session
 
 from . import DEFAULT_DB_PATH, DEFAULT_LOG_PATH
 from .schema import Base, create_default_projects, create_default_tray_types, AuditLog
+from .stats import register_cache_events
 
 
 class Database:
@@ -46,6 +47,9 @@ class Database:
         # pellet_scores session_date / tray_type).
         self._register_phase_hooks()
 
+        # Keep memoized stats summaries in step with writes made here
+        register_cache_events(self.SessionLocal)
+
         # Current user for audit logging
         self._current_user = os.environ.get('USERNAME', os.environ.get('USER', 'unknown'))
 
@@ -177,6 +181,25 @@ class Database:
                     # Column might already exist or other issue - log but don't fail
                     print(f"  Migration warning: {e}")
 
+        # Indexes declared on tables that existed before the index was added
+        index_migrations = [
+            ('pellet_scores', 'ix_pellet_scores_tray_score'),
+        ]
+
+        for table_name, index_name in index_migrations:
+            if table_name not in inspector.get_table_names():
+                continue
+
+            existing_indexes = [ix['name'] for ix in inspector.get_indexes(table_name)]
+            if index_name not in existing_indexes:
+                index = next(ix for ix in Base.metadata.tables[table_name].indexes
+                             if ix.name == index_name)
+                try:
+                    index.create(self.engine)
+                    print(f"  Migration: Added index {index_name}")
+                except Exception as e:
+                    print(f"  Migration warning: {e}")
+
     @contextmanager
     def session(self) -> Generator[Session, None, None]:
         """
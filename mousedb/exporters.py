@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 
+from sqlalchemy import select
+
 from .database import Database, get_db
 from .schema import Project, Cohort, Subject, Weight, PelletScore, Surgery
 from .stats import (
@@ -77,25 +79,33 @@ def export_cohort_to_excel(db: Database, cohort_id: str,
             pd.DataFrame(weight_data).to_excel(writer, sheet_name='1_Weight', index=False)
 
             # 3b_Manual_Tray sheet
-            pellets = session.query(PelletScore).filter(
-                PelletScore.subject_id.in_(subject_ids)
-            ).order_by(PelletScore.session_date, PelletScore.subject_id,
-                      PelletScore.tray_number).all()
+            # Stream plain column tuples in batches rather than materializing
+            # every pellet as an ORM object
+            pellets = session.execute(
+                select(PelletScore.session_date, PelletScore.subject_id,
+                       PelletScore.tray_type, PelletScore.tray_number,
+                       PelletScore.test_phase, PelletScore.pellet_number,
+                       PelletScore.score)
+                .where(PelletScore.subject_id.in_(subject_ids))
+                .order_by(PelletScore.session_date, PelletScore.subject_id,
+                          PelletScore.tray_number)
+                .execution_options(yield_per=10_000)
+            )
 
             # Group by session/animal/tray to create rows
             tray_rows = {}
-            for p in pellets:
-                key = (p.session_date, p.subject_id, p.tray_type, p.tray_number, p.test_phase)
+            for session_date, subject_id, tray_type, tray_number, test_phase, pellet_number, score in pellets:
+                key = (session_date, subject_id, tray_type, tray_number, test_phase)
                 if key not in tray_rows:
                     tray_rows[key] = {
-                        'Date': p.session_date,
-                        'Animal': p.subject_id,
-                        'Test_Phase': p.test_phase,
-                        'Tray Type/Number': f"{p.tray_type}{p.tray_number}",
+                        'Date': session_date,
+                        'Animal': subject_id,
+                        'Test_Phase': test_phase,
+                        'Tray Type/Number': f"{tray_type}{tray_number}",
                     }
                     for i in range(1, 21):
                         tray_rows[key][str(i)] = None
-                tray_rows[key][str(p.pellet_number)] = p.score
+                tray_rows[key][str(pellet_number)] = score
 
             tray_data = list(tray_rows.values())
             if tray_data:
@@ -305,29 +315,32 @@ def export_unified_to_parquet(db: Database, output_path: Optional[Path] = None)
         # Calculate session summaries per subject
         session_summaries = []
         for s in subjects:
-            # Get pellet score summaries by session
-            pellets = session.query(PelletScore).filter_by(subject_id=s.subject_id).all()
+            # Get pellet score summaries by session (only the columns used)
+            pellets = session.execute(
+                select(PelletScore.session_date, PelletScore.test_phase, PelletScore.score)
+                .where(PelletScore.subject_id == s.subject_id)
+            )
 
             # Group by session date
             sessions = {}
-            for p in pellets:
-                if p.session_date not in sessions:
-                    sessions[p.session_date] = {
+            for session_date, test_phase, score in pellets:
+                if session_date not in sessions:
+                    sessions[session_date] = {
                         'subject_id': s.subject_id,
-                        'session_date': p.session_date,
-                        'test_phase': p.test_phase,
+                        'session_date': session_date,
+                        'test_phase': test_phase,
                         'total_pellets': 0,
                         'miss_count': 0,
                         'displaced_count': 0,
                         'retrieved_count': 0,
                     }
-                sessions[p.session_date]['total_pellets'] += 1
-                if p.score == 0:
-                    sessions[p.session_date]['miss_count'] += 1
-                elif p.score == 1:
-                    sessions[p.session_date]['displaced_count'] += 1
-                elif p.score == 2:
-                    sessions[p.session_date]['retrieved_count'] += 1
+                sessions[session_date]['total_pellets'] += 1
+                if score == 0:
+                    sessions[session_date]['miss_count'] += 1
+                elif score == 1:
+                    sessions[session_date]['displaced_count'] += 1
+                elif score == 2:
+                    sessions[session_date]['retrieved_count'] += 1
 
             for sess in sessions.values():
                 total = sess['total_pellets']
@@ -50,7 +50,7 @@ from sqlalchemy import String
 from .. import protocols
 from ..stats import (
     calculate_daily_stats, calculate_subject_summary, calculate_cohort_summary,
-    get_cohort_overview, DailyStats, SubjectSummary, TrayStats
+    clear_stats_cache, get_cohort_overview, DailyStats, SubjectSummary, TrayStats
 )
 from .styles import STYLESHEET, COLORS, SCORE_COLORS, SCORE_LABELS
 from .timeline_gantt import TimelineGanttWidget, MiniTimelineWidget
@@ -1965,6 +1965,8 @@ class DashboardTab(QWidget):
 
     def _refresh_stats(self):
         """Refresh ALL statistics for the selected cohort."""
+        # "Recalculate" means from the database, not from memoized summaries
+        clear_stats_cache()
         cohort_id = self.cohort_combo.currentData()
         if not cohort_id:
             self._clear_stats()
@@ -4789,6 +4791,7 @@ class CohortSetupTab(QWidget):
 
     def _refresh_cohorts(self):
         """Refresh the cohorts table."""
+        clear_stats_cache()
         with self.db.session() as session:
             query = session.query(Cohort)
             if not self.show_archived_cb.isChecked():
@@ -18,12 +18,27 @@ from matplotlib.patches import FancyBboxPatch, FancyArrowPatch, Polygon
 import matplotlib.gridspec as gridspec
 import numpy as np
 import pandas as pd
+import re
 import sqlite3
 import argparse
+import functools
+import gc
+import hashlib
+import multiprocessing
+import os
+import pickle
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, date
 
+# seaborn is only needed for the fig_05 heatmap and fig_10 box/strip panels
+try:
+    import seaborn as sns
+    HAS_SEABORN = True
+except ImportError:
+    HAS_SEABORN = False
+
 # =============================================================================
 # PATHS
 # =============================================================================
@@ -33,6 +48,7 @@ DATA_SUMMARY = BASE / 'Tissue' / 'MouseBrain_Pipeline' / '3D_Cleared' / '2_Data_
 BEHAVIOR = BASE / 'Behavior' / 'MouseReach_Pipeline'
 DATABASES = BASE / 'Databases'
 SLICE_DATA = BASE / 'Tissue' / 'MouseBrain_Pipeline' / '2D_Slices' / 'ENCR' / 'batch_results'
+CACHE_DIR = DATABASES / '.cache' / 'lab_figures'
 
 BRAIN_IDS = [
     '349_CNT_01_02',
@@ -42,6 +58,18 @@ BRAIN_IDS = [
 ]
 BRAIN_LABELS = ['Brain 349', 'Brain 357', 'Brain 367', 'Brain 368']
 
+# Source files (filename has doubled brain ID)
+BRAIN_COUNT_CSVS = [DATA_SUMMARY / f'{bid}_{bid}_1p625x_z4_counts.csv' for bid in BRAIN_IDS]
+ELIFE_CSV = DATA_SUMMARY / 'elife_comparison_with_reference.csv'
+LATERALITY_CSV = DATA_SUMMARY / 'laterality' / 'hemisphere_laterality_analysis.csv'
+BATCH_2D_CSV = SLICE_DATA / 'batch_summary.csv'
+KINEMATICS_CSV = BEHAVIOR / 'reach_kinematics.csv'
+SUMMARY_CSV = BEHAVIOR / 'summary_for_PI.csv'
+CALIBRATION_CSV = DATA_SUMMARY / 'calibration_runs.csv'
+
+# Video short name (e.g., 20250101_CNT0101_P1) - \w+ is greedy, so keep the regex
+VIDEO_SHORT_NAME = re.compile(r'(\d{8}_\w+_P\d)')
+
 # =============================================================================
 # STYLE
 # =============================================================================
@@ -119,6 +147,11 @@ def draw_box(ax, x, y, w, h, text, color, text_color=C_TEXT, fontsize=10,
     return box
 
 
+def format_count(value):
+    """Format a row count with thousands separators; pass placeholders through."""
+    return f'{value:,}' if isinstance(value, int) else str(value)
+
+
 def draw_arrow(ax, x1, y1, x2, y2, label='', color=C_ARROW, fontsize=9,
                linewidth=1.5, style='->'):
     """Draw an arrow between two points."""
@@ -157,67 +190,109 @@ def draw_stat_card(ax, x, y, w, h, number, label, accent_color, fontsize_num=28,
 # DATA LOADERS
 # =============================================================================
 
+def _file_stamp(path):
+    """(path, mtime_ns, size) for an existing file, (path, None, None) otherwise."""
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def disk_cached(*source_paths):
+    """Pickle a loader's result in CACHE_DIR until its source files change.
+
+    The cache key is the mtime and size of each source path plus every
+    positional argument (loaders that take db_path are keyed on the DB file).
+    None results are not cached, and any cache read/write problem falls back
+    to calling the loader directly.
+    """
+    def decorate(loader):
+        @functools.wraps(loader)
+        def wrapper(*args):
+            stamp = [_file_stamp(p) for p in (*source_paths, *args)]
+            cache_path = CACHE_DIR / f'{loader.__name__}.pkl'
+            try:
+                with open(cache_path, 'rb') as f:
+                    cached_stamp, value = pickle.load(f)
+                if cached_stamp == stamp:
+                    return value
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+                pass
+            value = loader(*args)
+            if value is None:  # missing file or failed query: nothing worth keeping
+                return value
+            try:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                with open(cache_path, 'wb') as f:
+                    pickle.dump((stamp, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                pass
+            return value
+        return wrapper
+    return decorate
+
+
+@disk_cached(*BRAIN_COUNT_CSVS)
 def load_brain_counts():
     """Load cell counts for all brains. Returns dict of brain_id -> DataFrame."""
     counts = {}
-    for bid in BRAIN_IDS:
-        # Filename has doubled brain ID
-        pattern = f'{bid}_{bid}_1p625x_z4_counts.csv'
-        path = DATA_SUMMARY / pattern
+    for bid, path in zip(BRAIN_IDS, BRAIN_COUNT_CSVS):
         if path.exists():
             df = pd.read_csv(path)
             counts[bid] = df
     return counts
 
 
+@disk_cached(ELIFE_CSV)
 def load_elife_comparison():
     """Load eLife comparison data."""
-    path = DATA_SUMMARY / 'elife_comparison_with_reference.csv'
-    if path.exists():
-        return pd.read_csv(path)
+    if ELIFE_CSV.exists():
+        return pd.read_csv(ELIFE_CSV)
     return None
 
 
+@disk_cached(LATERALITY_CSV)
 def load_laterality():
     """Load hemisphere laterality analysis."""
-    path = DATA_SUMMARY / 'laterality' / 'hemisphere_laterality_analysis.csv'
-    if path.exists():
-        return pd.read_csv(path)
+    if LATERALITY_CSV.exists():
+        return pd.read_csv(LATERALITY_CSV)
     return None
 
 
+@disk_cached(BATCH_2D_CSV)
 def load_batch_2d():
     """Load 2D slice batch summary."""
-    path = SLICE_DATA / 'batch_summary.csv'
-    if path.exists():
-        return pd.read_csv(path)
+    if BATCH_2D_CSV.exists():
+        return pd.read_csv(BATCH_2D_CSV)
     return None
 
 
+@disk_cached(KINEMATICS_CSV)
 def load_reach_kinematics():
     """Load reach kinematics data."""
-    path = BEHAVIOR / 'reach_kinematics.csv'
-    if path.exists():
-        return pd.read_csv(path)
+    if KINEMATICS_CSV.exists():
+        return pd.read_csv(KINEMATICS_CSV)
     return None
 
 
+@disk_cached(SUMMARY_CSV)
 def load_reach_summary():
     """Load PI summary."""
-    path = BEHAVIOR / 'summary_for_PI.csv'
-    if path.exists():
-        return pd.read_csv(path)
+    if SUMMARY_CSV.exists():
+        return pd.read_csv(SUMMARY_CSV)
     return None
 
 
+@disk_cached(CALIBRATION_CSV)
 def load_calibration_runs():
     """Load calibration runs CSV."""
-    path = DATA_SUMMARY / 'calibration_runs.csv'
-    if path.exists():
-        return pd.read_csv(path)
+    if CALIBRATION_CSV.exists():
+        return pd.read_csv(CALIBRATION_CSV)
     return None
 
 
+@disk_cached()
 def query_db_stats(db_path):
     """Query database for summary statistics - all tables."""
     stats = {}
@@ -238,6 +313,7 @@ def query_db_stats(db_path):
     return stats
 
 
+@disk_cached()
 def query_pellet_phases(db_path):
     """Query pellet scores with test_phase already classified."""
     try:
@@ -255,7 +331,9 @@ def query_pellet_phases(db_path):
         """
         df = pd.read_sql_query(query, conn)
         conn.close()
-        return df
+        # score is NOT NULL and CHECKed to 0-2; the string columns are low-cardinality
+        return df.astype({'score': 'int8', 'test_phase': 'category',
+                          'subject_id': 'category', 'cohort_id': 'category'})
     except Exception as e:
         print(f'    DB query error: {e}')
         return None
@@ -267,6 +345,10 @@ def query_pellet_phases(db_path):
 
 def fig_01_project_overview(output_dir):
     """Connectome Project Overview schematic."""
+    key = render_key('fig_01_project_overview')
+    if is_up_to_date(output_dir, '01_connectome_project_overview.png', key):
+        return
+
     fig, ax = plt.subplots(1, 1, figsize=(16, 9))
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
@@ -357,11 +439,15 @@ def fig_01_project_overview(output_dir):
             ha='center', va='center', fontsize=10, color='#AAAAAA',
             style='italic')
 
-    save_fig(fig, output_dir, '01_connectome_project_overview.png')
+    save_fig(fig, output_dir, '01_connectome_project_overview.png', key=key)
 
 
 def fig_02_data_organization(output_dir):
     """Data organization and code/data separation schematic."""
+    key = render_key('fig_02_data_organization')
+    if is_up_to_date(output_dir, '02_data_organization.png', key):
+        return
+
     fig, ax = plt.subplots(1, 1, figsize=(16, 9))
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
@@ -436,11 +522,15 @@ def fig_02_data_organization(output_dir):
             'Rule: New code goes in Tool dirs. Pipeline dirs hold data only -- no exceptions.',
             ha='center', va='center', fontsize=11, color='#888888', style='italic')
 
-    save_fig(fig, output_dir, '02_data_organization.png')
+    save_fig(fig, output_dir, '02_data_organization.png', key=key)
 
 
 def fig_03_mousebrain_pipeline(output_dir):
     """MouseBrain 6-step pipeline schematic."""
+    key = render_key('fig_03_mousebrain_pipeline')
+    if is_up_to_date(output_dir, '03_mousebrain_pipeline.png', key):
+        return
+
     fig, ax = plt.subplots(1, 1, figsize=(16, 9))
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
@@ -502,7 +592,24 @@ def fig_03_mousebrain_pipeline(output_dir):
         ax.text(x, res_y - 0.03, desc, ha='center', va='center',
                 fontsize=9, color='#888888')
 
-    save_fig(fig, output_dir, '03_mousebrain_pipeline.png')
+    save_fig(fig, output_dir, '03_mousebrain_pipeline.png', key=key)
+
+
+def _region_count_matrix(brain_counts, brain_ids):
+    """Sorted region acronyms and a region x brain cell-count matrix.
+
+    Regions missing from a brain count 0. Rows without an acronym are
+    skipped, and an acronym listed twice for one brain is summed.
+    """
+    acronyms = {bid: brain_counts[bid].dropna(subset=['region_acronym']) for bid in brain_ids}
+    all_regions = sorted(set().union(*(df['region_acronym'] for df in acronyms.values())))
+    region_idx = {acr: i for i, acr in enumerate(all_regions)}
+    counts_mat = np.zeros((len(all_regions), len(brain_ids)))
+    for j, bid in enumerate(brain_ids):
+        df = acronyms[bid]
+        rows = df['region_acronym'].map(region_idx).to_numpy()
+        np.add.at(counts_mat[:, j], rows, df['cell_count'].fillna(0).to_numpy())
+    return all_regions, counts_mat
 
 
 def fig_04_brain_region_counts(output_dir, brain_counts):
@@ -511,28 +618,25 @@ def fig_04_brain_region_counts(output_dir, brain_counts):
         print('  [SKIP] fig_04: No brain count data')
         return
 
-    fig, ax = plt.subplots(1, 1, figsize=(16, 9))
+    key = render_key('fig_04_brain_region_counts', brain_counts)
+    if is_up_to_date(output_dir, '04_brain_region_counts.png', key):
+        return
 
-    # Merge all brains on region_acronym
-    merged = None
-    valid_brains = []
-    for i, bid in enumerate(BRAIN_IDS):
-        if bid in brain_counts:
-            df = brain_counts[bid][['region_acronym', 'cell_count']].copy()
-            df = df.rename(columns={'cell_count': bid})
-            if merged is None:
-                merged = df
-            else:
-                merged = merged.merge(df, on='region_acronym', how='outer')
-            valid_brains.append(bid)
-
-    if merged is None or len(valid_brains) == 0:
+    fig, ax = plt.subplots(1, 1, figsize=(16, 9), layout='constrained')
+
+    # Union of region_acronym across brains -> region x brain count matrix
+    valid_brains = [bid for bid in BRAIN_IDS if bid in brain_counts]
+    if len(valid_brains) == 0:
         print('  [SKIP] fig_04: No valid brain data')
+        plt.close(fig)
         return
 
-    # Fill NaN with 0, compute mean, sort, take top 15
-    merged = merged.fillna(0)
-    merged['mean'] = merged[valid_brains].mean(axis=1)
+    all_regions, counts_mat = _region_count_matrix(brain_counts, valid_brains)
+
+    # Compute mean, sort, take top 15
+    merged = pd.DataFrame(counts_mat, columns=valid_brains)
+    merged.insert(0, 'region_acronym', all_regions)
+    merged['mean'] = counts_mat.mean(axis=1)
     merged = merged.sort_values('mean', ascending=False).head(15)
 
     # Plot grouped bar
@@ -557,8 +661,7 @@ def fig_04_brain_region_counts(output_dir, brain_counts):
     ax.legend(loc='upper right', framealpha=0.9)
     ax.set_xlim(-0.5, len(merged) - 0.5)
 
-    plt.tight_layout(pad=1.5)
-    save_fig(fig, output_dir, '04_brain_region_counts.png')
+    save_fig(fig, output_dir, '04_brain_region_counts.png', key=key, pre_tightened=True)
 
 
 def fig_05_elife_comparison(output_dir, elife_df):
@@ -566,9 +669,16 @@ def fig_05_elife_comparison(output_dir, elife_df):
     if elife_df is None:
         print('  [SKIP] fig_05: No eLife comparison data')
         return
+    if not HAS_SEABORN:
+        print('  [SKIP] fig_05: seaborn not installed')
+        return
 
-    fig = plt.figure(figsize=(16, 9))
-    gs = gridspec.GridSpec(1, 2, width_ratios=[1, 1.3], wspace=0.4)
+    key = render_key('fig_05_elife_comparison', elife_df)
+    if is_up_to_date(output_dir, '05_elife_comparison.png', key):
+        return
+
+    fig = plt.figure(figsize=(16, 9), layout='constrained')
+    gs = fig.add_gridspec(1, 2, width_ratios=[1, 1.3])
 
     # Panel A: Heatmap (transposed - groups as rows for readability)
     ax1 = fig.add_subplot(gs[0])
@@ -584,8 +694,6 @@ def fig_05_elife_comparison(output_dir, elife_df):
     row_sums = heatmap_data.sum(axis=1)
     heatmap_pct = heatmap_data.div(row_sums, axis=0) * 100
 
-    import seaborn as sns
-
     # Transpose so functional groups are rows (readable) and brains are columns
     heatmap_T = heatmap_pct.T
     # Shorten row labels (functional groups)
@@ -625,8 +733,7 @@ def fig_05_elife_comparison(output_dir, elife_df):
     ax2.set_xlim(min(pct_change.values.min() * 1.1, -100),
                  max(pct_change.values.max() * 1.1, 100))
 
-    plt.tight_layout(pad=1.5)
-    save_fig(fig, output_dir, '05_elife_comparison.png')
+    save_fig(fig, output_dir, '05_elife_comparison.png', key=key, pre_tightened=True)
 
 
 def fig_06_hemisphere_laterality(output_dir, lat_df):
@@ -635,10 +742,14 @@ def fig_06_hemisphere_laterality(output_dir, lat_df):
         print('  [SKIP] fig_06: No laterality data')
         return
 
-    fig, ax = plt.subplots(1, 1, figsize=(16, 9))
+    key = render_key('fig_06_hemisphere_laterality', lat_df)
+    if is_up_to_date(output_dir, '06_hemisphere_laterality.png', key):
+        return
+
+    fig, ax = plt.subplots(1, 1, figsize=(16, 9), layout='constrained')
 
     # Sort by mean_total descending
-    lat_df = lat_df.sort_values('mean_total', ascending=True).copy()
+    lat_df = lat_df.sort_values('mean_total', ascending=True)
 
     groups = lat_df['elife_group'].values
     left = lat_df['mean_left'].values
@@ -654,15 +765,17 @@ def fig_06_hemisphere_laterality(output_dir, lat_df):
     ax.barh(y_pos, right, color='#F44336', edgecolor='white', linewidth=0.5,
             label='Right Hemisphere')
 
-    # Add individual brain dots
-    for brain_idx, bid in enumerate(['349', '357', '367']):
-        l_col = f'{bid}_left'
-        r_col = f'{bid}_right'
-        if l_col in lat_df.columns and r_col in lat_df.columns:
-            ax.scatter(-lat_df[l_col].values, y_pos, s=15, color='#1565C0',
-                       alpha=0.5, zorder=3, marker='o')
-            ax.scatter(lat_df[r_col].values, y_pos, s=15, color='#C62828',
-                       alpha=0.5, zorder=3, marker='o')
+    # Add individual brain dots (one collection per hemisphere)
+    dot_brains = [bid for bid in ['349', '357', '367']
+                  if f'{bid}_left' in lat_df.columns and f'{bid}_right' in lat_df.columns]
+    if dot_brains:
+        x_left = np.concatenate([lat_df[f'{bid}_left'].values for bid in dot_brains])
+        x_right = np.concatenate([lat_df[f'{bid}_right'].values for bid in dot_brains])
+        y_dots = np.tile(y_pos, len(dot_brains))
+        ax.scatter(-x_left, y_dots, s=15, color='#1565C0',
+                   alpha=0.5, zorder=3, marker='o')
+        ax.scatter(x_right, y_dots, s=15, color='#C62828',
+                   alpha=0.5, zorder=3, marker='o')
 
     # Significance markers
     for i, s in enumerate(sig):
@@ -687,8 +800,7 @@ def fig_06_hemisphere_laterality(output_dir, lat_df):
             fontsize=14, fontweight='bold', color='#F44336')
     ax.set_ylim(-0.5, len(groups) + 1.5)
 
-    plt.tight_layout(pad=1.5)
-    save_fig(fig, output_dir, '06_hemisphere_laterality.png')
+    save_fig(fig, output_dir, '06_hemisphere_laterality.png', key=key, pre_tightened=True)
 
 
 def fig_07_slice_quantification(output_dir, batch_df):
@@ -697,37 +809,36 @@ def fig_07_slice_quantification(output_dir, batch_df):
         print('  [SKIP] fig_07: No 2D batch data')
         return
 
+    key = render_key('fig_07_slice_quantification', batch_df)
+    if is_up_to_date(output_dir, '07_slice_quantification.png', key):
+        return
+
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 9),
                                     gridspec_kw={'width_ratios': [1.5, 1]})
 
     # Parse subject from sample name (e.g., E01_01_S1_R3 -> E01_01)
-    batch_df = batch_df.copy()
-    batch_df['subject'] = batch_df['sample'].str.extract(r'^(E\d+_\d+)')
-    batch_df['slice_info'] = batch_df['sample'].str.extract(r'(S\d+_.+)$')
+    batch_df = batch_df.assign(subject=batch_df['sample'].str.extract(r'^(E\d+_\d+)')[0])
 
     # Panel A: Fraction positive by subject
-    subjects = sorted(batch_df['subject'].dropna().unique())
-    subject_means = []
-    subject_sems = []
-    subject_counts = []
-    for subj in subjects:
-        vals = batch_df[batch_df['subject'] == subj]['fraction_positive']
-        subject_means.append(vals.mean())
-        subject_sems.append(vals.std() / np.sqrt(len(vals)) if len(vals) > 1 else 0)
-        subject_counts.append(len(vals))
+    subj_stats = batch_df.groupby('subject')['fraction_positive'].agg(['mean', 'std', 'size'])
+    subjects = subj_stats.index.tolist()  # sorted, NaN subjects dropped
+    subject_means = subj_stats['mean'].to_numpy()
+    subject_counts = subj_stats['size'].to_numpy()
+    subject_sems = np.where(subject_counts > 1,
+                            subj_stats['std'].to_numpy() / np.sqrt(subject_counts), 0)
 
     colors_subj = plt.cm.Set2(np.linspace(0, 1, len(subjects)))
     bars = ax1.bar(range(len(subjects)), subject_means, yerr=subject_sems,
                    color=colors_subj, edgecolor='white', linewidth=0.8,
                    capsize=4, error_kw={'linewidth': 1.5})
 
-    # Overlay individual points
-    for i, subj in enumerate(subjects):
-        vals = batch_df[batch_df['subject'] == subj]['fraction_positive']
-        jitter = np.random.normal(0, 0.08, size=len(vals))
-        ax1.scatter(np.full(len(vals), i) + jitter, vals,
-                    color=colors_subj[i], edgecolor='#333333', linewidth=0.5,
-                    s=25, alpha=0.7, zorder=3)
+    # Overlay individual points (one seeded jitter draw, one collection)
+    points = batch_df.dropna(subset=['subject'])
+    x_idx = points['subject'].map({subj: i for i, subj in enumerate(subjects)}).to_numpy(dtype=int)
+    jitter = np.random.default_rng(0).normal(0, 0.08, size=len(points))
+    ax1.scatter(x_idx + jitter, points['fraction_positive'],
+                color=colors_subj[x_idx], edgecolor='#333333', linewidth=0.5,
+                s=25, alpha=0.7, zorder=3)
 
     ax1.set_xticks(range(len(subjects)))
     ax1.set_xticklabels(subjects, rotation=45, ha='right', fontsize=10)
@@ -753,11 +864,15 @@ def fig_07_slice_quantification(output_dir, batch_df):
              ha='center', fontsize=11, color='#666666')
 
     plt.tight_layout(rect=[0, 0.06, 1, 0.98], pad=1.0)
-    save_fig(fig, output_dir, '07_slice_quantification.png')
+    save_fig(fig, output_dir, '07_slice_quantification.png', key=key, pre_tightened=True)
 
 
 def fig_08_mousereach_pipeline(output_dir):
     """MouseReach 6-step pipeline schematic."""
+    key = render_key('fig_08_mousereach_pipeline')
+    if is_up_to_date(output_dir, '08_mousereach_pipeline.png', key):
+        return
+
     fig, ax = plt.subplots(1, 1, figsize=(16, 9))
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
@@ -814,7 +929,7 @@ def fig_08_mousereach_pipeline(output_dir):
         ax.text(x, 0.21, desc, ha='center', va='center',
                 fontsize=9, color='#888888')
 
-    save_fig(fig, output_dir, '08_mousereach_pipeline.png')
+    save_fig(fig, output_dir, '08_mousereach_pipeline.png', key=key)
 
 
 def fig_09_reach_outcomes(output_dir, kin_df, summary_df):
@@ -823,7 +938,11 @@ def fig_09_reach_outcomes(output_dir, kin_df, summary_df):
         print('  [SKIP] fig_09: No reach kinematics data')
         return
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 9),
+    key = render_key('fig_09_reach_outcomes', kin_df, summary_df)
+    if is_up_to_date(output_dir, '09_reach_outcomes.png', key):
+        return
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 9), layout='constrained',
                                     gridspec_kw={'width_ratios': [1, 1.5]})
 
     # Panel A: Donut chart
@@ -854,27 +973,26 @@ def fig_09_reach_outcomes(output_dir, kin_df, summary_df):
 
     # Panel B: Per-video stacked bar
     if summary_df is not None:
-        summary = summary_df.copy()
         # Sort by success rate
-        summary['success_pct'] = summary['success_rate'].str.rstrip('%').astype(float)
+        summary = summary_df.assign(
+            success_pct=summary_df['success_rate'].str.rstrip('%').astype(float))
         summary = summary.sort_values('success_pct', ascending=True)
 
         # Shorten video names
         summary['short_name'] = summary['video'].str.extract(
-            r'(\d{8}_\w+_P\d)')[0].fillna(summary['video'])
+            VIDEO_SHORT_NAME)[0].fillna(summary['video'])
 
         y_pos = np.arange(len(summary))
         outcome_cols = ['retrieved', 'displaced_sa', 'displaced_outside', 'untouched']
         available_cols = [c for c in outcome_cols if c in summary.columns]
 
-        left = np.zeros(len(summary))
-        for col in available_cols:
-            vals = summary[col].fillna(0).values
-            color = OUTCOME_COLORS.get(col, '#BDC3C7')
-            label = col.replace('_', ' ').title()
-            ax2.barh(y_pos, vals, left=left, color=color, label=label,
+        vals = summary[available_cols].fillna(0).to_numpy(dtype=float)
+        lefts = np.cumsum(vals, axis=1) - vals
+        for j, col in enumerate(available_cols):
+            ax2.barh(y_pos, vals[:, j], left=lefts[:, j],
+                     color=OUTCOME_COLORS.get(col, '#BDC3C7'),
+                     label=col.replace('_', ' ').title(),
                      edgecolor='white', linewidth=0.3)
-            left += vals
 
         ax2.set_yticks(y_pos)
         ax2.set_yticklabels(summary['short_name'].values, fontsize=7)
@@ -883,8 +1001,7 @@ def fig_09_reach_outcomes(output_dir, kin_df, summary_df):
                        fontsize=14, pad=10)
         ax2.legend(loc='lower right', fontsize=9, framealpha=0.9)
 
-    plt.tight_layout(pad=1.5)
-    save_fig(fig, output_dir, '09_reach_outcomes.png')
+    save_fig(fig, output_dir, '09_reach_outcomes.png', key=key, pre_tightened=True)
 
 
 def fig_10_kinematic_comparison(output_dir, kin_df):
@@ -892,6 +1009,13 @@ def fig_10_kinematic_comparison(output_dir, kin_df):
     if kin_df is None:
         print('  [SKIP] fig_10: No reach kinematics data')
         return
+    if not HAS_SEABORN:
+        print('  [SKIP] fig_10: seaborn not installed')
+        return
+
+    key = render_key('fig_10_kinematic_comparison', kin_df)
+    if is_up_to_date(output_dir, '10_kinematic_comparison.png', key):
+        return
 
     fig = plt.figure(figsize=(16, 9))
     gs = gridspec.GridSpec(2, 3, hspace=0.45, wspace=0.35,
@@ -900,18 +1024,18 @@ def fig_10_kinematic_comparison(output_dir, kin_df):
                  fontsize=18, fontweight='bold', y=0.96)
 
     # Classify
-    df = kin_df.copy()
-    df['group'] = df['outcome'].apply(
-        lambda x: 'Retrieved' if x == 'retrieved' else 'Non-Retrieved')
+    derived = {'group': np.where(kin_df['outcome'].eq('retrieved'),
+                                 'Retrieved', 'Non-Retrieved')}
 
     # Compute absolute extent (raw values are signed displacements)
-    if 'extent_pixels' in df.columns:
-        df['reach_extent_px'] = df['extent_pixels'].abs()
-    if 'extent_mm' in df.columns:
-        df['reach_extent_mm'] = df['extent_mm'].abs()
+    if 'extent_pixels' in kin_df.columns:
+        derived['reach_extent_px'] = kin_df['extent_pixels'].abs()
+    if 'extent_mm' in kin_df.columns:
+        extent_mm = kin_df['extent_mm'].abs()
         # Remove extreme outliers (>99th percentile) for display
-        p99 = df['reach_extent_mm'].quantile(0.99)
-        df.loc[df['reach_extent_mm'] > p99, 'reach_extent_mm'] = np.nan
+        p99 = extent_mm.quantile(0.99)
+        derived['reach_extent_mm'] = extent_mm.mask(extent_mm > p99)
+    df = kin_df.assign(**derived)
 
     # Features to compare (using cleaned columns)
     features = [
@@ -921,9 +1045,12 @@ def fig_10_kinematic_comparison(output_dir, kin_df):
         ('reach_extent_mm', 'Reach Extent (mm)', fig.add_subplot(gs[1, 0])),
     ]
 
-    import seaborn as sns
     palette = {'Retrieved': '#27AE60', 'Non-Retrieved': '#95A5A6'}
 
+    # All per-feature quantiles in one pass (NaNs are skipped, same as after dropna)
+    feature_cols = [col for col, _, _ in features if col in df.columns]
+    quantiles = df[feature_cols].quantile([0.75, 0.95])
+
     for col, title, ax in features:
         if col not in df.columns:
             ax.text(0.5, 0.5, f'{col}\nnot available', ha='center',
@@ -936,7 +1063,7 @@ def fig_10_kinematic_comparison(output_dir, kin_df):
             continue
 
         # Clip display to 95th percentile to prevent outlier axis stretching
-        p95 = data[col].quantile(0.95)
+        p95 = quantiles.loc[0.95, col]
         display_data = data[data[col] <= p95 * 1.3].copy()
 
         sns.boxplot(x='group', y=col, data=display_data, ax=ax,
@@ -950,19 +1077,17 @@ def fig_10_kinematic_comparison(output_dir, kin_df):
         ax.set_ylabel(col.replace('_', ' '), fontsize=10)
 
         # Set y-axis to focus on IQR range
-        q75 = data[col].quantile(0.75)
+        q75 = quantiles.loc[0.75, col]
         ax.set_ylim(bottom=0, top=p95 * 1.4)
 
         # Add median annotations offset to avoid overlap with box
+        medians = data.groupby('group')[col].median()
         for i, grp in enumerate(['Non-Retrieved', 'Retrieved']):
-            vals = data[data['group'] == grp][col]
-            if len(vals) > 0:
-                med = vals.median()
+            if grp in medians.index:
+                med = medians[grp]
                 ax.annotate(f'{med:.1f}', xy=(i, min(med, p95 * 1.3)),
                             xytext=(8, 8), textcoords='offset points',
-                            fontsize=9, color='#333333', fontweight='bold',
-                            arrowprops=dict(arrowstyle='-', color='#999999',
-                                            lw=0.5))
+                            fontsize=9, color='#333333', fontweight='bold')
 
     # Panel E: Outcome distribution
     ax_pie = fig.add_subplot(gs[1, 1])
@@ -981,16 +1106,19 @@ def fig_10_kinematic_comparison(output_dir, kin_df):
     # Panel F: Summary stats
     ax_text = fig.add_subplot(gs[1, 2])
     ax_text.axis('off')
-    n_ret = len(df[df['group'] == 'Retrieved'])
-    n_nonret = len(df[df['group'] == 'Non-Retrieved'])
-    n_videos = df['video'].nunique()
-
-    # Compute actual medians for summary
-    med_dur_ret = df.loc[df['group'] == 'Retrieved', 'duration_ms'].median()
-    med_dur_non = df.loc[df['group'] == 'Non-Retrieved', 'duration_ms'].median()
-    med_ext_ret = df.loc[df['group'] == 'Retrieved', 'reach_extent_px'].median() \
+    n_ret = counts.get('Retrieved', 0)
+    n_nonret = counts.get('Non-Retrieved', 0)
+    n_videos = len(set(df['video'].dropna()))
+
+    # Compute actual medians for summary (one groupby for both groups)
+    summary_cols = ['duration_ms'] + (['reach_extent_px'] if 'reach_extent_px' in df.columns else [])
+    group_medians = df.groupby('group')[summary_cols].median().reindex(
+        ['Retrieved', 'Non-Retrieved'])
+    med_dur_ret = group_medians.loc['Retrieved', 'duration_ms']
+    med_dur_non = group_medians.loc['Non-Retrieved', 'duration_ms']
+    med_ext_ret = group_medians.loc['Retrieved', 'reach_extent_px'] \
         if 'reach_extent_px' in df.columns else 0
-    med_ext_non = df.loc[df['group'] == 'Non-Retrieved', 'reach_extent_px'].median() \
+    med_ext_non = group_medians.loc['Non-Retrieved', 'reach_extent_px'] \
         if 'reach_extent_px' in df.columns else 0
 
     summary_text = (
@@ -1011,7 +1139,7 @@ def fig_10_kinematic_comparison(output_dir, kin_df):
                  fontsize=10, va='top', fontfamily='monospace',
                  bbox=dict(boxstyle='round', facecolor='#F5F5F5', alpha=0.8))
 
-    save_fig(fig, output_dir, '10_kinematic_comparison.png')
+    save_fig(fig, output_dir, '10_kinematic_comparison.png', key=key)
 
 
 def fig_11_behavior_by_phase(output_dir, db_path):
@@ -1025,25 +1153,23 @@ def fig_11_behavior_by_phase(output_dir, db_path):
     fig.suptitle('Behavioral Performance Across Experimental Phases\n(Manual Pellet Scoring)',
                  fontsize=18, fontweight='bold', y=1.0)
 
-    df = pellet_df.copy()
-
-    # Map test_phase to major phases
-    def map_phase(tp):
-        tp_lower = tp.lower().replace('-', '_').replace(' ', '_')
-        if 'pre_injury' in tp_lower:
-            return 'Pre-Injury'
-        elif 'post_injury_test_1' in tp_lower or 'post_injury test 1' in tp.lower():
-            return 'Post-Injury 1'
-        elif any(f'post_injury_test_{i}' in tp_lower or f'post_injury test {i}' in tp.lower()
-                 for i in [2, 3, 4]):
-            return 'Post-Injury 2-4'
-        elif 'rehab' in tp_lower:
-            return 'Rehab'
-        elif 'training' in tp_lower:
-            return 'Training'
-        return 'Other'
-
-    df['phase'] = df['test_phase'].apply(map_phase)
+    df = pellet_df
+
+    # Map test_phase to major phases (first matching substring wins).
+    # test_phase is categorical, so classify the few categories, not every row.
+    categories = df['test_phase'].cat.categories
+    tp = (pd.Series(categories, index=categories).astype(str).str.lower()
+          .str.replace('-', '_', regex=False)
+          .str.replace(' ', '_', regex=False))
+    phase_by_category = pd.Series(np.select(
+        [tp.str.contains('pre_injury', regex=False),
+         tp.str.contains('post_injury_test_1', regex=False),
+         tp.str.contains('post_injury_test_[234]'),
+         tp.str.contains('rehab', regex=False),
+         tp.str.contains('training', regex=False)],
+        ['Pre-Injury', 'Post-Injury 1', 'Post-Injury 2-4', 'Rehab', 'Training'],
+        default='Other'), index=categories)
+    df['phase'] = df['test_phase'].map(phase_by_category).astype(object).fillna('Other')
     df = df[df['phase'].isin(['Pre-Injury', 'Post-Injury 1', 'Post-Injury 2-4', 'Rehab'])]
 
     if len(df) == 0:
@@ -1053,56 +1179,52 @@ def fig_11_behavior_by_phase(output_dir, db_path):
 
     # Score: 0=miss, 1=displaced, 2=retrieved
     phase_order = ['Pre-Injury', 'Post-Injury 1', 'Post-Injury 2-4', 'Rehab']
-    df['retrieved'] = (df['score'] == 2).astype(int)
-    df['contacted'] = (df['score'] >= 1).astype(int)
-
-    subj_phase = df.groupby(['subject_id', 'phase']).agg(
-        total=('score', 'count'),
-        retrieved=('retrieved', 'sum'),
-        contacted=('contacted', 'sum')
-    ).reset_index()
+    score = df['score']
+    flags = pd.DataFrame({
+        'total': score.notna(),
+        'retrieved': score.eq(2),
+        'contacted': score.ge(1),
+    })
+    subj_phase = flags.groupby([df['subject_id'], df['phase']], observed=True).sum().reset_index()
     subj_phase['retrieved_pct'] = subj_phase['retrieved'] / subj_phase['total'] * 100
     subj_phase['contacted_pct'] = subj_phase['contacted'] / subj_phase['total'] * 100
+    # One seeded draw for all scatter jitter (same x offset per subject in both panels)
+    subj_phase['jitter'] = np.random.default_rng(0).normal(0, 0.1, size=len(subj_phase))
 
-    # Panel A: Retrieved %
+    # Per-phase mean/SEM for both panels in one aggregation
     phase_colors = ['#3498DB', '#E74C3C', '#E67E22', '#2ECC71']
-    for i, phase in enumerate(phase_order):
-        data = subj_phase[subj_phase['phase'] == phase]['retrieved_pct']
-        if len(data) > 0:
-            ax1.bar(i, data.mean(), yerr=data.std()/np.sqrt(len(data)),
-                    color=phase_colors[i], alpha=0.7, capsize=5,
-                    edgecolor='white', linewidth=1)
-            jitter = np.random.normal(0, 0.1, size=len(data))
-            ax1.scatter(np.full(len(data), i) + jitter, data,
-                        color=phase_colors[i], edgecolor='#333333',
-                        linewidth=0.5, s=30, alpha=0.6, zorder=3)
-
-    ax1.set_xticks(range(len(phase_order)))
-    ax1.set_xticklabels(phase_order, rotation=20, ha='right', fontsize=10)
-    ax1.set_ylabel('% Pellets Retrieved')
-    ax1.set_title('A) Retrieved Rate by Phase', fontsize=14, pad=10)
-    ax1.set_ylim(0, max(subj_phase['retrieved_pct'].max() * 1.2, 30))
-
-    # Panel B: Contacted %
-    for i, phase in enumerate(phase_order):
-        data = subj_phase[subj_phase['phase'] == phase]['contacted_pct']
-        if len(data) > 0:
-            ax2.bar(i, data.mean(), yerr=data.std()/np.sqrt(len(data)),
-                    color=phase_colors[i], alpha=0.7, capsize=5,
-                    edgecolor='white', linewidth=1)
-            jitter = np.random.normal(0, 0.1, size=len(data))
-            ax2.scatter(np.full(len(data), i) + jitter, data,
-                        color=phase_colors[i], edgecolor='#333333',
-                        linewidth=0.5, s=30, alpha=0.6, zorder=3)
-
-    ax2.set_xticks(range(len(phase_order)))
-    ax2.set_xticklabels(phase_order, rotation=20, ha='right', fontsize=10)
-    ax2.set_ylabel('% Pellets Contacted')
-    ax2.set_title('B) Contacted Rate by Phase', fontsize=14, pad=10)
-    ax2.set_ylim(0, max(subj_phase['contacted_pct'].max() * 1.2, 60))
+    pct_cols = ['retrieved_pct', 'contacted_pct']
+    phase_stats = subj_phase.groupby('phase', observed=True)[pct_cols].agg(['mean', 'std', 'count'])
+    phase_stats = phase_stats.reindex(phase_order)
+    present = phase_stats[('retrieved_pct', 'count')].fillna(0).to_numpy() > 0
+    x_present = np.flatnonzero(present)
+    colors_present = [phase_colors[i] for i in x_present]
+
+    # Subject points: one scatter per panel, colored by phase
+    point_x = subj_phase['phase'].map({p: i for i, p in enumerate(phase_order)}).to_numpy(dtype=int)
+    point_colors = np.array(phase_colors)[point_x]
+
+    panels = [
+        (ax1, 'retrieved_pct', '% Pellets Retrieved', 'A) Retrieved Rate by Phase', 30),
+        (ax2, 'contacted_pct', '% Pellets Contacted', 'B) Contacted Rate by Phase', 60),
+    ]
+    for ax, col, ylabel, title, ymin_top in panels:
+        means = phase_stats[(col, 'mean')].to_numpy()[present]
+        sems = (phase_stats[(col, 'std')] / np.sqrt(phase_stats[(col, 'count')])).to_numpy()[present]
+        ax.bar(x_present, means, yerr=sems, color=colors_present, alpha=0.7,
+               capsize=5, edgecolor='white', linewidth=1)
+        ax.scatter(point_x + subj_phase['jitter'].to_numpy(), subj_phase[col],
+                   color=point_colors, edgecolor='#333333',
+                   linewidth=0.5, s=30, alpha=0.6, zorder=3, rasterized=True)
+
+        ax.set_xticks(range(len(phase_order)))
+        ax.set_xticklabels(phase_order, rotation=20, ha='right', fontsize=10)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title, fontsize=14, pad=10)
+        ax.set_ylim(0, max(subj_phase[col].max() * 1.2, ymin_top))
 
     # Summary
-    n_subjects = df['subject_id'].nunique()
+    n_subjects = len(set(df['subject_id'].dropna()))
     n_scores = len(df)
     fig.text(0.5, 0.02,
              f'N={n_subjects} subjects | {n_scores:,} pellet scores | '
@@ -1110,11 +1232,15 @@ def fig_11_behavior_by_phase(output_dir, db_path):
              ha='center', fontsize=11, color='#666666')
 
     plt.tight_layout(rect=[0, 0.05, 1, 0.93], pad=1.0)
-    save_fig(fig, output_dir, '11_behavior_by_phase.png')
+    save_fig(fig, output_dir, '11_behavior_by_phase.png', pre_tightened=True)
 
 
 def fig_12_mousecam_system(output_dir):
     """MouseCam system schematic."""
+    key = render_key('fig_12_mousecam_system')
+    if is_up_to_date(output_dir, '12_mousecam_system.png', key):
+        return
+
     fig, ax = plt.subplots(1, 1, figsize=(16, 9))
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
@@ -1184,11 +1310,15 @@ def fig_12_mousecam_system(output_dir):
             draw_arrow(ax, x + 0.08, flow_y, x + 0.11, flow_y,
                        linewidth=1.5, color=C_CAM)
 
-    save_fig(fig, output_dir, '12_mousecam_system.png')
+    save_fig(fig, output_dir, '12_mousecam_system.png', key=key)
 
 
 def fig_13_database_schema(output_dir, db_stats):
     """Database schema overview."""
+    key = render_key('fig_13_database_schema', db_stats)
+    if is_up_to_date(output_dir, '13_database_schema.png', key):
+        return
+
     fig, ax = plt.subplots(1, 1, figsize=(16, 9))
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
@@ -1205,36 +1335,22 @@ def fig_13_database_schema(output_dir, db_stats):
     # Table clusters - positioned to avoid overlap
     clusters = [
         # (center_x, center_y, title, tables, color, arrow_target_y)
-        (0.17, 0.55, 'Behavioral Data', [
-            ('pellet_scores', db_stats.get('pellet_scores', '?')),
-            ('reach_data', db_stats.get('reach_data', '?')),
-            ('weights', db_stats.get('weights', '?')),
-            ('ladder_entries', db_stats.get('ladder_entries', '?')),
-        ], C_REACH, 0.77),
-        (0.50, 0.50, 'Subject Management', [
-            ('subjects', db_stats.get('subjects', '?')),
-            ('cohorts', db_stats.get('cohorts', '?')),
-            ('surgeries', db_stats.get('surgeries', '?')),
-            ('protocols', db_stats.get('protocols', '?')),
-        ], C_DB, 0.77),
-        (0.83, 0.55, 'Tissue / Imaging', [
-            ('brain_samples', db_stats.get('brain_samples', '?')),
-            ('calibration_runs', db_stats.get('calibration_runs', '?')),
-            ('region_counts', db_stats.get('region_counts', '?')),
-            ('detected_cells', db_stats.get('detected_cells', '?')),
-        ], C_BRAIN, 0.77),
-        (0.17, 0.22, 'Pipeline / Audit', [
-            ('pipeline_data', db_stats.get('pipeline_data', '?')),
-            ('audit_log', db_stats.get('audit_log', '?')),
-            ('archived_summaries', db_stats.get('archived_summaries', '?')),
-        ], '#9E9E9E', 0.77),
-        (0.83, 0.22, 'Protocol System', [
-            ('protocol_phases', db_stats.get('protocol_phases', '?')),
-            ('tray_types', db_stats.get('tray_types', '?')),
-            ('session_exceptions', db_stats.get('session_exceptions', '?')),
-        ], '#9E9E9E', 0.77),
+        (0.17, 0.55, 'Behavioral Data',
+            ['pellet_scores', 'reach_data', 'weights', 'ladder_entries'], C_REACH, 0.77),
+        (0.50, 0.50, 'Subject Management',
+            ['subjects', 'cohorts', 'surgeries', 'protocols'], C_DB, 0.77),
+        (0.83, 0.55, 'Tissue / Imaging',
+            ['brain_samples', 'calibration_runs', 'region_counts', 'detected_cells'], C_BRAIN, 0.77),
+        (0.17, 0.22, 'Pipeline / Audit',
+            ['pipeline_data', 'audit_log', 'archived_summaries'], '#9E9E9E', 0.77),
+        (0.83, 0.22, 'Protocol System',
+            ['protocol_phases', 'tray_types', 'session_exceptions'], '#9E9E9E', 0.77),
     ]
 
+    # Format every count once, up front
+    counts = {tname: format_count(db_stats.get(tname, '?'))
+              for _, _, _, tables, _, _ in clusters for tname in tables}
+
     for cx, cy, title, tables, color, arrow_ty in clusters:
         # Cluster background
         row_h = 0.042
@@ -1244,12 +1360,11 @@ def fig_13_database_schema(output_dir, db_stats):
         ax.text(cx, cy + cluster_h/2 - 0.02, title, ha='center', va='center',
                 fontsize=12, fontweight='bold', color=color)
 
-        for i, (tname, tcount) in enumerate(tables):
+        for i, tname in enumerate(tables):
             ty = cy + cluster_h/2 - 0.065 - i * row_h
-            count_str = f'{tcount:,}' if isinstance(tcount, int) else str(tcount)
             ax.text(cx - 0.10, ty, tname, ha='left', va='center',
                     fontsize=9, color=C_TEXT, fontfamily='monospace')
-            ax.text(cx + 0.10, ty, count_str, ha='right', va='center',
+            ax.text(cx + 0.10, ty, counts[tname], ha='right', va='center',
                     fontsize=9, color='#888888')
 
         # Line (not arrow) from cluster to central DB
@@ -1263,11 +1378,16 @@ def fig_13_database_schema(output_dir, db_stats):
             'Automatic DPI calculation | Cascading deletes',
             ha='center', va='center', fontsize=10, color='#888888')
 
-    save_fig(fig, output_dir, '13_database_schema.png')
+    save_fig(fig, output_dir, '13_database_schema.png', key=key)
 
 
 def fig_14_project_scale(output_dir, db_stats, brain_counts, kin_df, batch_df, cal_df):
     """Project scale infographic with big-number stat cards."""
+    key = render_key('fig_14_project_scale', db_stats, brain_counts, kin_df,
+                     batch_df, cal_df)
+    if is_up_to_date(output_dir, '14_project_scale.png', key):
+        return
+
     fig, ax = plt.subplots(1, 1, figsize=(16, 9))
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
@@ -1314,59 +1434,49 @@ def fig_14_project_scale(output_dir, db_stats, brain_counts, kin_df, batch_df, c
             'All data tracked in connectome.db with full audit trail',
             ha='center', va='center', fontsize=11, color='#AAAAAA')
 
-    save_fig(fig, output_dir, '14_project_scale.png')
+    save_fig(fig, output_dir, '14_project_scale.png', key=key)
 
 
 def fig_15_processing_progress(output_dir, cal_df):
     """Processing timeline and milestones."""
-    fig, ax = plt.subplots(1, 1, figsize=(16, 9))
+    fig, ax = plt.subplots(1, 1, figsize=(16, 9), layout='constrained')
 
     if cal_df is not None and 'created_at' in cal_df.columns:
         # Parse timestamps
-        cal = cal_df.copy()
-        cal['date'] = pd.to_datetime(cal['created_at'], errors='coerce')
+        cal = cal_df.assign(date=pd.to_datetime(cal_df['created_at'], errors='coerce'))
         cal = cal.dropna(subset=['date'])
-        cal['date_only'] = cal['date'].dt.date
-
-        # Cumulative runs over time
-        daily_counts = cal.groupby('date_only').size().reset_index(name='count')
-        daily_counts['date_only'] = pd.to_datetime(daily_counts['date_only'])
-        daily_counts = daily_counts.sort_values('date_only')
-        daily_counts['cumulative'] = daily_counts['count'].cumsum()
-
-        ax.fill_between(daily_counts['date_only'], daily_counts['cumulative'],
-                        alpha=0.3, color=C_BRAIN)
-        ax.plot(daily_counts['date_only'], daily_counts['cumulative'],
-                color=C_BRAIN, linewidth=2.5, marker='o', markersize=4)
+
+        # Cumulative runs over time (np.unique returns days sorted)
+        days, counts = np.unique(cal['date'].dt.floor('D').to_numpy(), return_counts=True)
+        cumulative = counts.cumsum()
+
+        ax.fill_between(days, cumulative, alpha=0.3, color=C_BRAIN)
+        ax.plot(days, cumulative, color=C_BRAIN, linewidth=2.5, marker='o', markersize=4)
         ax.set_xlabel('Date')
         ax.set_ylabel('Cumulative Calibration Runs')
         ax.set_title('Processing Progress: Calibration Run History',
                      fontsize=18, fontweight='bold')
 
         # Annotate milestones
-        if len(daily_counts) > 0:
-            last = daily_counts.iloc[-1]
-            ax.annotate(f'{int(last["cumulative"])} total runs',
-                        xy=(last['date_only'], last['cumulative']),
+        if len(days) > 0:
+            ax.annotate(f'{int(cumulative[-1])} total runs',
+                        xy=(days[-1], cumulative[-1]),
                         xytext=(30, 20), textcoords='offset points',
                         fontsize=12, fontweight='bold', color=C_BRAIN,
                         arrowprops=dict(arrowstyle='->', color=C_BRAIN))
 
         # Brain processing milestones (from calibration runs)
         if 'brain' in cal.columns:
-            brain_firsts = cal.groupby('brain')['date'].min().sort_values()
-            milestone_brains = []
-            for brain, first_date in brain_firsts.items():
-                if isinstance(brain, str) and brain.startswith(('349', '357', '367', '368')):
-                    short_name = brain[:3]
-                    # Deduplicate by brain number
-                    if short_name not in [m[0] for m in milestone_brains]:
-                        cum_at_date = daily_counts[daily_counts['date_only'] <= pd.Timestamp(first_date)]['cumulative']
-                        if len(cum_at_date) > 0:
-                            milestone_brains.append((short_name, first_date, cum_at_date.iloc[-1]))
+            # Earliest run per brain number, in order of first appearance
+            firsts = cal.groupby(cal['brain'].astype(str).str[:3])['date'].min()
+            firsts = firsts[firsts.index.isin(['349', '357', '367', '368'])].sort_values()
+            # Cumulative count on the last day at or before each first run
+            pos = np.searchsorted(days, firsts.to_numpy(), side='right') - 1
+            found = pos >= 0
+            milestone_brains = list(zip(firsts.index[found], firsts[found],
+                                        cumulative[pos[found]]))
 
             # Stagger annotation y-offsets to avoid overlap
-            y_max = daily_counts['cumulative'].max()
             for idx, (short_name, first_date, y_val) in enumerate(milestone_brains):
                 y_offset = 25 + idx * 18  # Stagger vertically
                 ax.axvline(first_date, color=BRAIN_COLORS[idx % len(BRAIN_COLORS)],
@@ -1387,31 +1497,158 @@ def fig_15_processing_progress(output_dir, cal_df):
         ax.text(0.5, 0.5, 'Processing Progress\n(calibration_runs.csv not available)',
                 ha='center', va='center', fontsize=16, color='#888888')
 
-    plt.tight_layout(pad=1.5)
-    save_fig(fig, output_dir, '15_processing_progress.png')
+    save_fig(fig, output_dir, '15_processing_progress.png', pre_tightened=True)
 
 
 # =============================================================================
 # SAVE AND MAIN
 # =============================================================================
 
-def save_fig(fig, output_dir, filename):
-    """Save figure to output directory."""
+# Output settings (see configure_output): --force ignores render keys,
+# --dpi / --no-tight / --draft trade quality for save speed while iterating,
+# --fast-png trades file size for PNG encode speed (same pixels)
+FORCE_REGENERATE = False
+SAVE_DPI = 300
+SAVE_TIGHT = True
+SAVE_FAST_PNG = False
+
+
+def configure_output(force=False, dpi=300, tight=True, fast_png=False):
+    """Set the module-level output settings used by save_fig and render keys."""
+    global FORCE_REGENERATE, SAVE_DPI, SAVE_TIGHT, SAVE_FAST_PNG
+    FORCE_REGENERATE = force
+    SAVE_DPI = dpi
+    SAVE_TIGHT = tight
+    SAVE_FAST_PNG = fast_png
+
+
+def _hash_input(h, obj):
+    """Feed one figure input (DataFrame, dict of inputs, or plain value) into h."""
+    if isinstance(obj, pd.DataFrame):
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        h.update(','.join(map(str, obj.columns)).encode())
+    elif isinstance(obj, dict):
+        for k in sorted(obj, key=str):
+            h.update(repr(k).encode())
+            _hash_input(h, obj[k])
+    else:
+        h.update(repr(obj).encode())
+
+
+def render_key(name, *inputs):
+    """Hash this module's source plus a figure's input data.
+
+    Inputs may be None, DataFrames, plain values (db_stats counts), or dicts
+    of any of these (brain_counts). Schematics with no inputs are keyed on
+    the source alone, so they re-render only when this module changes.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    h.update(f'{name}|dpi={SAVE_DPI}|tight={SAVE_TIGHT}'.encode())
+    for obj in inputs:
+        _hash_input(h, obj)
+    return h.hexdigest()
+
+
+def is_up_to_date(output_dir, filename, key):
+    """True if filename exists and was rendered from the same render key."""
+    key_path = output_dir / f'{filename}.key'
+    if FORCE_REGENERATE or not (output_dir / filename).exists() or not key_path.exists():
+        return False
+    if key_path.read_text() != key:
+        return False
+    print(f'  [CACHED] {filename}')
+    return True
+
+
+def save_fig(fig, output_dir, filename, key=None, pre_tightened=False):
+    """Save figure to output directory (and its render key, if given).
+
+    pre_tightened: the figure already ran tight_layout or uses constrained
+    layout, so skip the extra bbox_inches='tight' measuring pass.
+    """
     path = output_dir / filename
-    fig.savefig(str(path), dpi=300, bbox_inches='tight',
-                facecolor='white', edgecolor='none')
+    tight = SAVE_TIGHT and not pre_tightened
+    # matplotlib writes PNGs through Pillow; level 1 zlib is ~3-5x faster to encode
+    pil_kwargs = {'compress_level': 1} if SAVE_FAST_PNG else None
+    fig.savefig(str(path), dpi=SAVE_DPI, bbox_inches='tight' if tight else None,
+                facecolor='white', edgecolor='none', pil_kwargs=pil_kwargs)
     plt.close(fig)
+    if key is not None:
+        (output_dir / f'{filename}.key').write_text(key)
     print(f'  [OK] {filename}')
 
 
+# Figure number -> function and the named data inputs it takes after output_dir
+FIGURES = [
+    # Section 1: Project Overview
+    (1, fig_01_project_overview, ()),
+    (2, fig_02_data_organization, ()),
+    # Section 2: 3D Brain
+    (3, fig_03_mousebrain_pipeline, ()),
+    (4, fig_04_brain_region_counts, ('brain_counts',)),
+    (5, fig_05_elife_comparison, ('elife_df',)),
+    (6, fig_06_hemisphere_laterality, ('lat_df',)),
+    # Section 3: 2D Slices
+    (7, fig_07_slice_quantification, ('batch_df',)),
+    # Section 4: Behavior
+    (8, fig_08_mousereach_pipeline, ()),
+    (9, fig_09_reach_outcomes, ('kin_df', 'summary_df')),
+    (10, fig_10_kinematic_comparison, ('kin_df',)),
+    (11, fig_11_behavior_by_phase, ('db_path',)),
+    # Section 5: Video Collection
+    (12, fig_12_mousecam_system, ()),
+    # Section 6: Cross-Pipeline
+    (13, fig_13_database_schema, ('db_stats',)),
+    (14, fig_14_project_scale, ('db_stats', 'brain_counts', 'kin_df', 'batch_df', 'cal_df')),
+    (15, fig_15_processing_progress, ('cal_df',)),
+]
+
+
+def run_figure(num, func, args):
+    """Generate one figure, reporting (not raising) any failure."""
+    try:
+        func(*args)
+    except Exception as e:
+        print(f'  [FAIL] fig_{num:02d}: {e}')
+        traceback.print_exc()
+    finally:
+        # A figure that raised mid-draw never reached save_fig's close;
+        # figures hold reference cycles, so collect now to keep RSS flat
+        plt.close('all')
+        gc.collect()
+
+
+def _init_worker(force, dpi, tight, fast_png):
+    """Process-pool initializer: workers start fresh, so restore style and flags."""
+    configure_output(force=force, dpi=dpi, tight=tight, fast_png=fast_png)
+    apply_style()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate lab meeting figures')
     parser.add_argument('--output-dir', type=str, default=None,
                         help='Output directory for figures')
     parser.add_argument('--only', type=str, default=None,
                         help='Comma-separated figure numbers to generate (e.g., 04,05,10)')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate figures even if their inputs are unchanged')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for rendering (default: CPU count; 1 = serial)')
+    parser.add_argument('--dpi', type=int, default=None,
+                        help='Save resolution (default: 300, or 100 with --draft)')
+    parser.add_argument('--no-tight', action='store_true',
+                        help="Skip bbox_inches='tight' (saves one render pass per figure)")
+    parser.add_argument('--draft', action='store_true',
+                        help='Fast iteration output: 100 dpi, no tight bbox')
+    parser.add_argument('--fast-png', action='store_true',
+                        help='Encode PNGs with low zlib compression (faster, larger files)')
     args = parser.parse_args()
 
+    dpi = args.dpi or (100 if args.draft else 300)
+    tight = not (args.no_tight or args.draft)
+    configure_output(force=args.force, dpi=dpi, tight=tight, fast_png=args.fast_png)
+
     # Output directory
     if args.output_dir:
         output_dir = Path(args.output_dir)
@@ -1424,6 +1661,9 @@ def main():
     only = None
     if args.only:
         only = [int(x.strip()) for x in args.only.split(',')]
+        unknown = sorted(set(only) - {num for num, _, _ in FIGURES})
+        if unknown:
+            parser.error(f'--only: no such figure(s): {unknown}')
 
     print('Lab Meeting Figure Generator')
     print('=' * 40)
@@ -1433,150 +1673,69 @@ def main():
     # Apply style
     apply_style()
 
+    # Only load the data sources the selected figures take
+    selected = [(num, func, arg_names) for num, func, arg_names in FIGURES
+                if only is None or num in only]
+    needed = {name for _, _, arg_names in selected for name in arg_names}
+
     # Load data
     print('Loading data sources...')
-    brain_counts = load_brain_counts()
-    print(f'  Brain counts: {len(brain_counts)} brains loaded')
+    db_path = DATABASES / 'connectome.db'
+    inputs = {'db_path': db_path}
 
-    elife_df = load_elife_comparison()
-    print(f'  eLife comparison: {"loaded" if elife_df is not None else "not found"}')
+    if 'brain_counts' in needed:
+        inputs['brain_counts'] = brain_counts = load_brain_counts()
+        print(f'  Brain counts: {len(brain_counts)} brains loaded')
 
-    lat_df = load_laterality()
-    print(f'  Laterality: {"loaded" if lat_df is not None else "not found"}')
+    if 'elife_df' in needed:
+        inputs['elife_df'] = elife_df = load_elife_comparison()
+        print(f'  eLife comparison: {"loaded" if elife_df is not None else "not found"}')
 
-    batch_df = load_batch_2d()
-    print(f'  2D batch: {len(batch_df) if batch_df is not None else 0} samples')
+    if 'lat_df' in needed:
+        inputs['lat_df'] = lat_df = load_laterality()
+        print(f'  Laterality: {"loaded" if lat_df is not None else "not found"}')
 
-    kin_df = load_reach_kinematics()
-    print(f'  Reach kinematics: {len(kin_df) if kin_df is not None else 0} reaches')
+    if 'batch_df' in needed:
+        inputs['batch_df'] = batch_df = load_batch_2d()
+        print(f'  2D batch: {len(batch_df) if batch_df is not None else 0} samples')
 
-    summary_df = load_reach_summary()
-    print(f'  PI summary: {len(summary_df) if summary_df is not None else 0} videos')
+    if 'kin_df' in needed:
+        inputs['kin_df'] = kin_df = load_reach_kinematics()
+        print(f'  Reach kinematics: {len(kin_df) if kin_df is not None else 0} reaches')
 
-    cal_df = load_calibration_runs()
-    print(f'  Calibration runs: {len(cal_df) if cal_df is not None else 0} runs')
+    if 'summary_df' in needed:
+        inputs['summary_df'] = summary_df = load_reach_summary()
+        print(f'  PI summary: {len(summary_df) if summary_df is not None else 0} videos')
 
-    db_path = DATABASES / 'connectome.db'
-    db_stats = query_db_stats(db_path)
-    print(f'  Database: {len(db_stats)} tables queried')
+    if 'cal_df' in needed:
+        inputs['cal_df'] = cal_df = load_calibration_runs()
+        print(f'  Calibration runs: {len(cal_df) if cal_df is not None else 0} runs')
+
+    if 'db_stats' in needed:
+        inputs['db_stats'] = db_stats = query_db_stats(db_path)
+        print(f'  Database: {len(db_stats)} tables queried')
 
     print()
     print('Generating figures...')
 
-    def should_gen(num):
-        return only is None or num in only
+    tasks = [(num, func, (output_dir, *(inputs[name] for name in arg_names)))
+             for num, func, arg_names in selected]
 
-    # Section 1: Project Overview
-    if should_gen(1):
-        try:
-            fig_01_project_overview(output_dir)
-        except Exception as e:
-            print(f'  [FAIL] fig_01: {e}')
-            traceback.print_exc()
-
-    if should_gen(2):
-        try:
-            fig_02_data_organization(output_dir)
-        except Exception as e:
-            print(f'  [FAIL] fig_02: {e}')
-            traceback.print_exc()
-
-    # Section 2: 3D Brain
-    if should_gen(3):
-        try:
-            fig_03_mousebrain_pipeline(output_dir)
-        except Exception as e:
-            print(f'  [FAIL] fig_03: {e}')
-            traceback.print_exc()
-
-    if should_gen(4):
-        try:
-            fig_04_brain_region_counts(output_dir, brain_counts)
-        except Exception as e:
-            print(f'  [FAIL] fig_04: {e}')
-            traceback.print_exc()
-
-    if should_gen(5):
-        try:
-            fig_05_elife_comparison(output_dir, elife_df)
-        except Exception as e:
-            print(f'  [FAIL] fig_05: {e}')
-            traceback.print_exc()
-
-    if should_gen(6):
-        try:
-            fig_06_hemisphere_laterality(output_dir, lat_df)
-        except Exception as e:
-            print(f'  [FAIL] fig_06: {e}')
-            traceback.print_exc()
-
-    # Section 3: 2D Slices
-    if should_gen(7):
-        try:
-            fig_07_slice_quantification(output_dir, batch_df)
-        except Exception as e:
-            print(f'  [FAIL] fig_07: {e}')
-            traceback.print_exc()
-
-    # Section 4: Behavior
-    if should_gen(8):
-        try:
-            fig_08_mousereach_pipeline(output_dir)
-        except Exception as e:
-            print(f'  [FAIL] fig_08: {e}')
-            traceback.print_exc()
-
-    if should_gen(9):
-        try:
-            fig_09_reach_outcomes(output_dir, kin_df, summary_df)
-        except Exception as e:
-            print(f'  [FAIL] fig_09: {e}')
-            traceback.print_exc()
-
-    if should_gen(10):
-        try:
-            fig_10_kinematic_comparison(output_dir, kin_df)
-        except Exception as e:
-            print(f'  [FAIL] fig_10: {e}')
-            traceback.print_exc()
-
-    if should_gen(11):
-        try:
-            fig_11_behavior_by_phase(output_dir, db_path)
-        except Exception as e:
-            print(f'  [FAIL] fig_11: {e}')
-            traceback.print_exc()
-
-    # Section 5: Video Collection
-    if should_gen(12):
-        try:
-            fig_12_mousecam_system(output_dir)
-        except Exception as e:
-            print(f'  [FAIL] fig_12: {e}')
-            traceback.print_exc()
-
-    # Section 6: Cross-Pipeline
-    if should_gen(13):
-        try:
-            fig_13_database_schema(output_dir, db_stats)
-        except Exception as e:
-            print(f'  [FAIL] fig_13: {e}')
-            traceback.print_exc()
-
-    if should_gen(14):
-        try:
-            fig_14_project_scale(output_dir, db_stats, brain_counts, kin_df,
-                                  batch_df, cal_df)
-        except Exception as e:
-            print(f'  [FAIL] fig_14: {e}')
-            traceback.print_exc()
-
-    if should_gen(15):
-        try:
-            fig_15_processing_progress(output_dir, cal_df)
-        except Exception as e:
-            print(f'  [FAIL] fig_15: {e}')
-            traceback.print_exc()
+    jobs = min(args.jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        for num, func, fig_args in tasks:
+            run_figure(num, func, fig_args)
+    else:
+        # spawn, not fork: forked children inherit matplotlib/font-cache locks
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx,
+                                 initializer=_init_worker,
+                                 initargs=(FORCE_REGENERATE, SAVE_DPI, SAVE_TIGHT,
+                                           SAVE_FAST_PNG)) as pool:
+            futures = [pool.submit(run_figure, num, func, fig_args)
+                       for num, func, fig_args in tasks]
+            for future in futures:
+                future.result()
 
     print()
     print(f'Done! Figures saved to {output_dir}')
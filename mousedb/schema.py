@@ -10,7 +10,7 @@ from datetime import datetime, date
 from typing import Optional, List
 from sqlalchemy import (
     create_engine, Column, Integer, String, Float, Date, DateTime,
-    Text, ForeignKey, CheckConstraint, Computed, UniqueConstraint, event
+    Text, ForeignKey, CheckConstraint, Computed, Index, UniqueConstraint, event
 )
 from sqlalchemy.orm import declarative_base, relationship, validates, Session
 from sqlalchemy.engine import Engine
@@ -428,6 +428,10 @@ class PelletScore(Base):
         CheckConstraint('tray_number BETWEEN 1 AND 4', name='valid_tray_number'),
         CheckConstraint('pellet_number BETWEEN 1 AND 20', name='valid_pellet_number'),
         CheckConstraint('score IN (0, 1, 2)', name='valid_score'),
+        # Covers the per-tray score counts in mousedb.stats: rows are read from
+        # the index alone, already in GROUP BY order
+        Index('ix_pellet_scores_tray_score',
+              'subject_id', 'session_date', 'tray_type', 'tray_number', 'score'),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
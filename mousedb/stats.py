@@ -8,16 +8,166 @@ Calculates the same stats as the legacy Excel tracking sheets:
 - Weight percentage tracking
 """
 
+import functools
+import os
+import sqlite3
+import threading
 from datetime import date, timedelta
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import case, event, func, select
+from sqlalchemy.orm import Session, object_session
 
 from .schema import Subject, Cohort, Weight, PelletScore, Surgery
 
 
+# =============================================================================
+# SUMMARY CACHE
+# =============================================================================
+
+# Memoized subject/cohort summaries, keyed by (function, engine, id). They are
+# built from committed data only: a session holding flushed, uncommitted writes
+# computes its own summaries without touching the cache, and the cache is
+# cleared when such a session commits, and whenever another connection or
+# process commits to the database file.
+_SUMMARY_CACHE_MAX = 1024
+_summary_cache: Dict[Tuple[str, Any, str], Any] = {}
+
+# Session.info flag: the session has written since its last commit/rollback
+_UNCOMMITTED_WRITES = '_stats_uncommitted_writes'
+
+# Per SQLite engine: a read-only connection used only for PRAGMA data_version,
+# and the version last seen on it. The connection is closed by engine.dispose().
+_data_version_conns: Dict[Any, sqlite3.Connection] = {}
+_data_versions: Dict[Any, int] = {}
+_data_version_lock = threading.Lock()
+
+
+def clear_stats_cache(*_args) -> None:
+    """Drop all memoized summaries.
+
+    Called automatically when a session that wrote subjects, cohorts,
+    weights, pellet scores or surgeries commits, and before a lookup when a
+    SQLite database file has been committed to since the last one (raw-SQL
+    writers such as backfill_phases, or mousereach-sync in another process).
+    """
+    _summary_cache.clear()
+
+
+def _close_data_version_conn(engine) -> None:
+    """Close the PRAGMA data_version connection opened for engine."""
+    with _data_version_lock:
+        conn = _data_version_conns.pop(engine, None)
+        _data_versions.pop(engine, None)
+    if conn is not None:
+        conn.close()
+
+
+def _sqlite_data_version(engine) -> Optional[int]:
+    """PRAGMA data_version of a file-backed SQLite engine, else None.
+
+    The value changes whenever any other connection, in this process or
+    another, commits to the file. It is read on a dedicated connection that
+    never writes, so every commit counts as "other".
+    """
+    if engine.dialect.name != 'sqlite':
+        return None
+    database = engine.url.database
+    if not database or database == ':memory:' or database.startswith('file:'):
+        return None
+    with _data_version_lock:
+        conn = _data_version_conns.get(engine)
+        try:
+            if conn is None:
+                conn = sqlite3.connect(f"{Path(os.path.abspath(database)).as_uri()}?mode=ro",
+                                       uri=True, check_same_thread=False)
+                _data_version_conns[engine] = conn
+                if not event.contains(engine, 'engine_disposed', _close_data_version_conn):
+                    event.listen(engine, 'engine_disposed', _close_data_version_conn)
+            return conn.execute('PRAGMA data_version').fetchone()[0]
+        except sqlite3.Error:
+            # e.g. the file doesn't exist yet; fall back to the session events
+            _data_version_conns.pop(engine, None)
+            return None
+
+
+def _clear_if_database_changed(engine) -> None:
+    """Clear the cache if the engine's SQLite file was committed to since last checked."""
+    version = _sqlite_data_version(engine)
+    if version is None:
+        return
+    if _data_versions.get(engine) != version:
+        _data_versions[engine] = version
+        clear_stats_cache()
+
+
+def _mark_written(mapper, connection, target) -> None:
+    """Flag the session that flushed target as holding uncommitted writes."""
+    session = object_session(target)
+    if session is not None:
+        session.info[_UNCOMMITTED_WRITES] = True
+
+
+def _mark_bulk_write(orm_execute_state) -> None:
+    """Flag a session running an ORM-enabled bulk INSERT/UPDATE/DELETE."""
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_UNCOMMITTED_WRITES] = True
+
+
+def _clear_after_commit(session) -> None:
+    """Drop summaries made stale by a session's now-committed writes."""
+    if session.info.pop(_UNCOMMITTED_WRITES, False):
+        clear_stats_cache()
+
+
+def _forget_rolled_back_writes(session) -> None:
+    """Rolled-back writes never reached the cache; just drop the flag."""
+    session.info.pop(_UNCOMMITTED_WRITES, None)
+
+
+def register_cache_events(session_factory) -> None:
+    """Keep the summary cache in step with writes made through session_factory.
+
+    Database registers these on its sessionmaker. For sessions made any
+    other way, a commit is only noticed through PRAGMA data_version (file
+    SQLite databases); their own uncommitted writes are still never cached.
+    """
+    event.listen(session_factory, 'do_orm_execute', _mark_bulk_write)
+    event.listen(session_factory, 'after_commit', _clear_after_commit)
+    event.listen(session_factory, 'after_rollback', _forget_rolled_back_writes)
+
+
+for _model in (Subject, Cohort, Weight, PelletScore, Surgery):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _mark_written)
+
+
+def _memoized(fn):
+    """Cache ``fn(db_session, key)`` per database engine and key.
+
+    Every caller gets the same cached object, so treat results as read-only.
+    """
+    @functools.wraps(fn)
+    def wrapper(db_session: Session, key: str):
+        if db_session.info.get(_UNCOMMITTED_WRITES):
+            # Summaries of this session's uncommitted data are its own
+            return fn(db_session, key)
+        bind = db_session.get_bind()
+        _clear_if_database_changed(bind.engine)
+        cache_key = (fn.__name__, bind, key)
+        if cache_key in _summary_cache:
+            return _summary_cache[cache_key]
+        result = fn(db_session, key)
+        if len(_summary_cache) >= _SUMMARY_CACHE_MAX:
+            _summary_cache.clear()
+        _summary_cache[cache_key] = result
+        return result
+    return wrapper
+
+
 @dataclass
 class TrayStats:
     """Statistics for a single tray (20 pellets)."""
@@ -57,7 +207,11 @@ class TrayStats:
 
 @dataclass
 class DailyStats:
-    """Statistics for a single day/session (typically 4 trays = 80 pellets)."""
+    """Statistics for a single day/session (typically 4 trays = 80 pellets).
+
+    Totals and percentages are computed on first access and cached, so
+    build ``trays`` completely before reading them.
+    """
     subject_id: str
     session_date: date
     test_phase: str
@@ -66,79 +220,79 @@ class DailyStats:
     baseline_weight: Optional[float] = None
     injury_date: Optional[date] = None
 
-    @property
+    @functools.cached_property
     def total_presented(self) -> int:
         return sum(t.presented for t in self.trays)
 
-    @property
+    @functools.cached_property
     def total_miss(self) -> int:
         return sum(t.miss for t in self.trays)
 
-    @property
+    @functools.cached_property
     def total_displaced(self) -> int:
         return sum(t.displaced for t in self.trays)
 
-    @property
+    @functools.cached_property
     def total_retrieved(self) -> int:
         return sum(t.retrieved for t in self.trays)
 
-    @property
+    @functools.cached_property
     def total_contacted(self) -> int:
         return sum(t.contacted for t in self.trays)
 
-    @property
+    @functools.cached_property
     def total_entered(self) -> int:
         return sum(t.entered for t in self.trays)
 
-    @property
+    @functools.cached_property
     def miss_pct(self) -> float:
         return (self.total_miss / self.total_presented * 100) if self.total_presented > 0 else 0.0
 
-    @property
+    @functools.cached_property
     def displaced_pct(self) -> float:
         return (self.total_displaced / self.total_presented * 100) if self.total_presented > 0 else 0.0
 
-    @property
+    @functools.cached_property
     def retrieved_pct(self) -> float:
         return (self.total_retrieved / self.total_presented * 100) if self.total_presented > 0 else 0.0
 
-    @property
+    @functools.cached_property
     def contacted_pct(self) -> float:
         return (self.total_contacted / self.total_presented * 100) if self.total_presented > 0 else 0.0
 
-    @property
+    @functools.cached_property
     def avg_miss_pct(self) -> float:
         """Average miss percentage across trays"""
         if not self.trays:
             return 0.0
         return sum(t.miss_pct for t in self.trays) / len(self.trays)
 
-    @property
+    @functools.cached_property
     def avg_displaced_pct(self) -> float:
         if not self.trays:
             return 0.0
         return sum(t.displaced_pct for t in self.trays) / len(self.trays)
 
-    @property
+    @functools.cached_property
     def avg_retrieved_pct(self) -> float:
         if not self.trays:
             return 0.0
         return sum(t.retrieved_pct for t in self.trays) / len(self.trays)
 
-    @property
+    @functools.cached_property
     def avg_contacted_pct(self) -> float:
         if not self.trays:
             return 0.0
         return sum(t.contacted_pct for t in self.trays) / len(self.trays)
 
-    @property
+    @functools.cached_property
     def weight_pct(self) -> Optional[float]:
         """Weight as percentage of baseline"""
         if self.weight_grams and self.baseline_weight and self.baseline_weight > 0:
             return (self.weight_grams / self.baseline_weight) * 100
         return None
 
-    @property
+    @functools.cached_property
     def days_post_injury(self) -> Optional[int]:
         """Days since injury (negative = pre-injury)"""
         if self.injury_date:
@@ -148,7 +302,10 @@ class DailyStats:
 
 @dataclass
 class SubjectSummary:
-    """Summary statistics for a single subject across all sessions."""
+    """Summary statistics for a single subject across all sessions.
+
+    Like DailyStats, the aggregate properties are cached on first access.
+    """
     subject_id: str
     cohort_id: str
     sex: str
@@ -158,21 +315,21 @@ class SubjectSummary:
     injury_displacement_um: Optional[float]
     sessions: List[DailyStats] = field(default_factory=list)
 
-    @property
+    @functools.cached_property
     def total_sessions(self) -> int:
         return len(self.sessions)
 
-    @property
+    @functools.cached_property
     def total_pellets_scored(self) -> int:
         return sum(s.total_entered for s in self.sessions)
 
-    @property
+    @functools.cached_property
     def overall_retrieved_pct(self) -> float:
         total = sum(s.total_presented for s in self.sessions)
         retrieved = sum(s.total_retrieved for s in self.sessions)
         return (retrieved / total * 100) if total > 0 else 0.0
 
-    @property
+    @functools.cached_property
     def overall_contacted_pct(self) -> float:
         total = sum(s.total_presented for s in self.sessions)
         contacted = sum(s.total_contacted for s in self.sessions)
@@ -191,53 +348,97 @@ class SubjectSummary:
         return [s for s in self.sessions if s.session_date >= self.injury_date]
 
 
-def calculate_tray_stats(session: Session, subject_id: str,
-                         session_date: date, tray_type: str,
-                         tray_number: int) -> TrayStats:
-    """Calculate stats for a single tray."""
-    pellets = session.query(PelletScore).filter_by(
+def _tray_counts_select(*criteria):
+    """One row per (subject, day, tray): subject_id, session_date, tray_type,
+    tray_number, miss, displaced, retrieved, pivoted in SQL with conditional sums.
+    """
+    tray_key = (PelletScore.subject_id, PelletScore.session_date,
+                PelletScore.tray_type, PelletScore.tray_number)
+    return (
+        select(
+            *tray_key,
+            func.sum(case((PelletScore.score == 0, 1), else_=0)).label('miss'),
+            func.sum(case((PelletScore.score == 1, 1), else_=0)).label('displaced'),
+            func.sum(case((PelletScore.score == 2, 1), else_=0)).label('retrieved'),
+        )
+        .where(*criteria)
+        .group_by(*tray_key)
+        .order_by(*tray_key)
+    )
+
+
+def _tray_stats_by_day(db_session: Session,
+                       *criteria) -> Dict[Tuple[str, date], Dict[Tuple[str, int], TrayStats]]:
+    """Count pellet outcomes per (subject, day, tray) with one GROUP BY.
+
+    Returns {(subject_id, session_date): {(tray_type, tray_number): TrayStats}}
+    for the PelletScore rows matching ``criteria``.
+    """
+    days = {}
+    rows = db_session.execute(_tray_counts_select(*criteria))
+    for subject_id, session_date, tray_type, tray_number, miss, displaced, retrieved in rows:
+        days.setdefault((subject_id, session_date), {})[(tray_type, tray_number)] = TrayStats(
+            tray_type=tray_type, tray_number=tray_number,
+            miss=miss, displaced=displaced, retrieved=retrieved)
+    return days
+
+
+def _first_test_phases(db_session: Session, *criteria) -> Dict[Tuple[str, date], str]:
+    """Test phase of the first-entered pellet per (subject, day) matching ``criteria``."""
+    first_ids = (select(func.min(PelletScore.id))
+                 .where(*criteria)
+                 .group_by(PelletScore.subject_id, PelletScore.session_date))
+    rows = db_session.execute(
+        select(PelletScore.subject_id, PelletScore.session_date, PelletScore.test_phase)
+        .where(PelletScore.id.in_(first_ids))
+    )
+    return {(subject_id, session_date): test_phase
+            for subject_id, session_date, test_phase in rows}
+
+
+def _build_daily_stats(subject_id: str, session_date: date, test_phase: str,
+                       trays: Dict[Tuple[str, int], TrayStats],
+                       weight: Optional[Weight], baseline: Optional[Weight],
+                       contusion: Optional[Surgery]) -> DailyStats:
+    """Assemble DailyStats from counts and rows already loaded for one subject/day."""
+    return DailyStats(
         subject_id=subject_id,
         session_date=session_date,
-        tray_type=tray_type,
-        tray_number=tray_number
-    ).all()
+        test_phase=test_phase,
+        trays=[trays[key] for key in sorted(trays)],
+        weight_grams=weight.weight_grams if weight else None,
+        baseline_weight=baseline.weight_grams if baseline else None,
+        injury_date=contusion.surgery_date if contusion else None
+    )
 
-    stats = TrayStats(tray_type=tray_type, tray_number=tray_number)
-    for p in pellets:
-        if p.score == 0:
-            stats.miss += 1
-        elif p.score == 1:
-            stats.displaced += 1
-        elif p.score == 2:
-            stats.retrieved += 1
 
-    return stats
+def calculate_tray_stats(session: Session, subject_id: str,
+                         session_date: date, tray_type: str,
+                         tray_number: int) -> TrayStats:
+    """Calculate stats for a single tray."""
+    days = _tray_stats_by_day(
+        session,
+        PelletScore.subject_id == subject_id,
+        PelletScore.session_date == session_date,
+        PelletScore.tray_type == tray_type,
+        PelletScore.tray_number == tray_number,
+    )
+    trays = days.get((subject_id, session_date), {})
+    return trays.get((tray_type, tray_number),
+                     TrayStats(tray_type=tray_type, tray_number=tray_number))
 
 
 def calculate_daily_stats(db_session: Session, subject_id: str,
                           session_date: date) -> DailyStats:
     """Calculate all stats for a single day/session."""
-    # Get test phase and tray info
-    pellets = db_session.query(PelletScore).filter_by(
-        subject_id=subject_id,
-        session_date=session_date
-    ).all()
+    criteria = (PelletScore.subject_id == subject_id,
+                PelletScore.session_date == session_date)
+    trays = _tray_stats_by_day(db_session, *criteria).get((subject_id, session_date))
 
-    if not pellets:
+    if not trays:
         return DailyStats(subject_id=subject_id, session_date=session_date, test_phase="")
 
-    test_phase = pellets[0].test_phase
-
-    # Get unique tray combinations
-    tray_keys = set((p.tray_type, p.tray_number) for p in pellets)
-
-    # Calculate per-tray stats
-    trays = []
-    for tray_type, tray_number in sorted(tray_keys):
-        tray_stats = calculate_tray_stats(
-            db_session, subject_id, session_date, tray_type, tray_number
-        )
-        trays.append(tray_stats)
+    test_phase = _first_test_phases(db_session, *criteria)[(subject_id, session_date)]
 
     # Get weight for this day
     weight = db_session.query(Weight).filter_by(
@@ -256,106 +457,120 @@ def calculate_daily_stats(db_session: Session, subject_id: str,
         surgery_type='contusion'
     ).first()
 
-    return DailyStats(
-        subject_id=subject_id,
-        session_date=session_date,
-        test_phase=test_phase,
-        trays=trays,
-        weight_grams=weight.weight_grams if weight else None,
-        baseline_weight=baseline.weight_grams if baseline else None,
-        injury_date=contusion.surgery_date if contusion else None
-    )
+    return _build_daily_stats(subject_id, session_date, test_phase, trays,
+                              weight, baseline, contusion)
+
+
+def _summarize_subjects(db_session: Session,
+                        subjects: List[Subject]) -> Dict[str, SubjectSummary]:
+    """Build SubjectSummary objects for several subjects from bulk queries.
 
+    Pellet counts, weights and contusions are each fetched with one query
+    filtered on ``subject_id IN (...)`` and bucketed by subject in Python.
+    """
+    subject_ids = [s.subject_id for s in subjects]
+
+    # First contusion per subject
+    contusions = {}
+    for surgery in db_session.query(Surgery).filter(
+            Surgery.subject_id.in_(subject_ids),
+            Surgery.surgery_type == 'contusion'
+    ).order_by(Surgery.id):
+        contusions.setdefault(surgery.subject_id, surgery)
+
+    # Weights, oldest first: the first per subject is the baseline
+    baselines = {}
+    weights = {}
+    for w in db_session.query(Weight).filter(
+            Weight.subject_id.in_(subject_ids)
+    ).order_by(Weight.date):
+        baselines.setdefault(w.subject_id, w)
+        weights[(w.subject_id, w.date)] = w
+
+    # Per-day, per-tray outcome counts
+    criteria = (PelletScore.subject_id.in_(subject_ids),)
+    days = _tray_stats_by_day(db_session, *criteria)
+    phases = _first_test_phases(db_session, *criteria)
+
+    sessions = {}
+    for key, trays in sorted(days.items()):
+        subject_id, sess_date = key
+        sessions.setdefault(subject_id, []).append(_build_daily_stats(
+            subject_id, sess_date, phases[key], trays, weights.get(key),
+            baselines.get(subject_id), contusions.get(subject_id)))
 
+    summaries = {}
+    for subject in subjects:
+        contusion = contusions.get(subject.subject_id)
+        summaries[subject.subject_id] = SubjectSummary(
+            subject_id=subject.subject_id,
+            cohort_id=subject.cohort_id,
+            sex=subject.sex or '',
+            date_of_birth=subject.date_of_birth,
+            injury_date=contusion.surgery_date if contusion else None,
+            injury_force_kdyn=contusion.force_kdyn if contusion else None,
+            injury_displacement_um=contusion.displacement_um if contusion else None,
+            sessions=sessions.get(subject.subject_id, [])
+        )
+    return summaries
+
+
+@_memoized
 def calculate_subject_summary(db_session: Session, subject_id: str) -> SubjectSummary:
-    """Calculate complete summary for a subject."""
-    # Get subject info
+    """Calculate complete summary for a subject (shared and cached; don't modify it)."""
     subject = db_session.query(Subject).filter_by(subject_id=subject_id).first()
     if not subject:
         raise ValueError(f"Subject not found: {subject_id}")
 
-    # Get contusion info
-    contusion = db_session.query(Surgery).filter_by(
-        subject_id=subject_id,
-        surgery_type='contusion'
-    ).first()
-
-    # Get all unique session dates
-    session_dates = db_session.query(PelletScore.session_date).filter_by(
-        subject_id=subject_id
-    ).distinct().order_by(PelletScore.session_date).all()
-
-    # Calculate daily stats for each session
-    sessions = []
-    for (sess_date,) in session_dates:
-        daily = calculate_daily_stats(db_session, subject_id, sess_date)
-        sessions.append(daily)
-
-    return SubjectSummary(
-        subject_id=subject_id,
-        cohort_id=subject.cohort_id,
-        sex=subject.sex or '',
-        date_of_birth=subject.date_of_birth,
-        injury_date=contusion.surgery_date if contusion else None,
-        injury_force_kdyn=contusion.force_kdyn if contusion else None,
-        injury_displacement_um=contusion.displacement_um if contusion else None,
-        sessions=sessions
-    )
+    return _summarize_subjects(db_session, [subject])[subject_id]
 
 
+@_memoized
 def calculate_cohort_summary(db_session: Session, cohort_id: str) -> Dict[str, SubjectSummary]:
-    """Calculate summaries for all subjects in a cohort."""
+    """Calculate summaries for all subjects in a cohort (shared and cached; don't modify them)."""
     subjects = db_session.query(Subject).filter_by(cohort_id=cohort_id).all()
+    if not subjects:
+        return {}
 
-    summaries = {}
-    for subject in subjects:
-        summaries[subject.subject_id] = calculate_subject_summary(
-            db_session, subject.subject_id
-        )
-
-    return summaries
+    return _summarize_subjects(db_session, subjects)
 
 
+@_memoized
 def get_cohort_overview(db_session: Session, cohort_id: str) -> Dict[str, Any]:
-    """Get high-level overview stats for a cohort."""
+    """Get high-level overview stats for a cohort (shared and cached; don't modify it)."""
     cohort = db_session.query(Cohort).filter_by(cohort_id=cohort_id).first()
     if not cohort:
         return {}
 
-    subjects = db_session.query(Subject).filter_by(cohort_id=cohort_id).all()
-    subject_ids = [s.subject_id for s in subjects]
+    subject_ids = [
+        row.subject_id for row in
+        db_session.query(Subject.subject_id).filter_by(cohort_id=cohort_id)
+    ]
+
+    # Sessions, pellets and score breakdown per subject in one pass
+    rows = db_session.execute(
+        select(
+            PelletScore.subject_id,
+            func.count(func.distinct(PelletScore.session_date)),
+            func.count(PelletScore.id),
+            func.sum(case((PelletScore.score == 0, 1), else_=0)),
+            func.sum(case((PelletScore.score == 1, 1), else_=0)),
+            func.sum(case((PelletScore.score == 2, 1), else_=0)),
+        )
+        .where(PelletScore.subject_id.in_(subject_ids))
+        .group_by(PelletScore.subject_id)
+    ).all()
 
-    # Count sessions per subject
-    session_counts = db_session.query(
-        PelletScore.subject_id,
-        func.count(func.distinct(PelletScore.session_date))
-    ).filter(
-        PelletScore.subject_id.in_(subject_ids)
-    ).group_by(PelletScore.subject_id).all()
-
-    # Total pellet scores
-    total_pellets = db_session.query(func.count(PelletScore.id)).filter(
-        PelletScore.subject_id.in_(subject_ids)
-    ).scalar() or 0
-
-    # Score breakdown
-    score_counts = db_session.query(
-        PelletScore.score,
-        func.count(PelletScore.id)
-    ).filter(
-        PelletScore.subject_id.in_(subject_ids)
-    ).group_by(PelletScore.score).all()
-
-    scores = {0: 0, 1: 0, 2: 0}
-    for score, count in score_counts:
-        scores[score] = count
+    session_counts = {subject_id: n_sessions for subject_id, n_sessions, *_ in rows}
+    total_pellets = sum(row[2] for row in rows)
+    scores = {score: sum(row[3 + score] for row in rows) for score in (0, 1, 2)}
 
     return {
         'cohort_id': cohort_id,
         'project_code': cohort.project_code,
         'start_date': cohort.start_date,
-        'num_subjects': len(subjects),
-        'sessions_per_subject': dict(session_counts),
+        'num_subjects': len(subject_ids),
+        'sessions_per_subject': session_counts,
         'total_pellets_scored': total_pellets,
         'total_miss': scores[0],
         'total_displaced': scores[1],
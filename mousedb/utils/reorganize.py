@@ -1,23 +1,73 @@
+import numpy as np
 import pandas as pd
 import os
 import glob
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# Rust-backed Excel reader; much faster than openpyxl on large workbooks
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+EXCEL_ENGINE = 'calamine' if HAS_CALAMINE else None  # None = pandas default (openpyxl)
+
+META_COLS = ['Date', 'Animal', 'Sex', 'Weight', 'Tray Type/Number']
 
 def list_excel_files():
     """Find all Excel files in current directory"""
     excel_files = glob.glob("*.xlsx") + glob.glob("*.xls")
     return excel_files
 
-def list_sheets(file_path):
-    """List all sheets in an Excel file"""
+# Open workbooks, reused for every sheet read from the same file in this process
+_workbooks = {}
+
+def _workbook(file_path):
+    """Open an Excel file once per process; later calls reuse the parsed workbook"""
+    xl_file = _workbooks.get(file_path)
+    if xl_file is None:
+        xl_file = _workbooks[file_path] = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
+    return xl_file
+
+def close_workbooks():
+    """Close every workbook opened by _workbook"""
+    for xl_file in _workbooks.values():
+        xl_file.close()
+    _workbooks.clear()
+
+def open_workbook(file_path):
+    """Open an Excel file, reporting files locked by another program"""
     try:
-        xl_file = pd.ExcelFile(file_path)
-        return xl_file.sheet_names
+        return _workbook(file_path)
     except PermissionError:
         print(f"\n[FAIL] ERROR: Cannot access {file_path}")
         print("  The file is likely open in Excel or another program.")
         print("  Please close it and try again.\n")
         return None
 
+def list_sheets(file_path):
+    """List all sheets in an Excel file"""
+    xl_file = open_workbook(file_path)
+    if xl_file is None:
+        return None
+    return xl_file.sheet_names
+
+def is_pellet_column(col):
+    """True for column labels 1-20 (int or string)"""
+    try:
+        return 1 <= int(col) <= 20
+    except (ValueError, TypeError):
+        return False
+
+def is_needed_column(col):
+    """Columns reorganize_sheet uses; passed as usecols so the rest are never parsed"""
+    return col in META_COLS or is_pellet_column(col)
+
+# Separators between selected numbers: commas and/or whitespace
+SELECTION_SEPARATOR = re.compile(r'[,\s]+')
+
 def get_user_selection(items, item_type="item"):
     """Let user select items from a numbered list"""
     print(f"\nAvailable {item_type}s:")
@@ -26,18 +76,32 @@ def get_user_selection(items, item_type="item"):
     
     print(f"\nEnter {item_type} numbers separated by commas (e.g., 1,3,5)")
     print(f"Or enter 'all' to select all {item_type}s")
-    selection = input("Selection: ").strip()
-    
-    if selection.lower() == 'all':
-        return items
     
-    try:
-        indices = [int(x.strip()) - 1 for x in selection.split(',')]
-        selected = [items[i] for i in indices if 0 <= i < len(items)]
-        return selected
-    except (ValueError, IndexError):
+    # Ask again until the input parses, rather than recursing per retry
+    while True:
+        selection = input("Selection: ").strip()
+        
+        if selection.lower() == 'all':
+            return items
+        
+        try:
+            indices = [int(x) - 1 for x in SELECTION_SEPARATOR.split(selection) if x]
+        except ValueError:
+            indices = []
+        
+        if indices:
+            return [items[i] for i in indices if 0 <= i < len(items)]
         print("Invalid selection. Please try again.")
-        return get_user_selection(items, item_type)
+
+def downcast_scores(values):
+    """Store 0/1/2 scores as nullable Int8; leave anything non-integral as is"""
+    scores = pd.Series(values)
+    numeric = pd.to_numeric(scores, errors='coerce')
+    valid = numeric.dropna()
+    if (len(valid) == scores.notna().sum() and (valid % 1 == 0).all()
+            and valid.between(-128, 127).all()):
+        return numeric.astype('Int8')
+    return scores
 
 def reorganize_sheet(df):
     """Reshape one sheet from wide to long format"""
@@ -45,7 +109,7 @@ def reorganize_sheet(df):
     print(f"  Found {len(df.columns)} columns: {df.columns.tolist()}")
     
     # Keep metadata columns
-    meta_cols = ['Date', 'Animal', 'Sex', 'Weight', 'Tray Type/Number']
+    meta_cols = META_COLS
     
     # Check if all expected columns exist
     missing_cols = [col for col in meta_cols if col not in df.columns]
@@ -53,144 +117,183 @@ def reorganize_sheet(df):
         print(f"  [FAIL] Missing expected columns: {missing_cols}")
         return None
     
-    # Identify pellet columns - anything after the metadata columns
-    # They could be integers, strings, or mixed
-    pellet_cols = [col for col in df.columns if col not in meta_cols]
+    # Identify pellet columns: labels 1-20, as integers, strings, or mixed.
+    # Convert the whole header at once; metadata and other labels become NaN.
+    col_nums = pd.to_numeric(pd.Series(df.columns), errors='coerce')
+    is_pellet = (col_nums.between(1, 20) & (col_nums % 1 == 0)).to_numpy()
+    pellet_cols = df.columns[is_pellet].tolist()
     
-    # Filter to get only the first 20 pellet columns (in case there are extras)
-    # Try to identify numeric columns that represent pellet positions
-    numeric_pellet_cols = []
-    for col in pellet_cols:
-        # Check if column name can be converted to int and is in range 1-20
-        try:
-            col_num = int(col)
-            if 1 <= col_num <= 20:
-                numeric_pellet_cols.append(col)
-        except (ValueError, TypeError):
-            # Not a numeric column name, skip it
-            pass
-    
-    if len(numeric_pellet_cols) < 20:
-        print(f"  [!] Warning: Only found {len(numeric_pellet_cols)} pellet columns")
-        print(f"      Using these columns: {numeric_pellet_cols}")
-    
-    if len(numeric_pellet_cols) == 0:
+    if len(pellet_cols) < 20:
+        print(f"  [!] Warning: Only found {len(pellet_cols)} pellet columns")
+        print(f"      Using these columns: {pellet_cols}")
+    
+    if len(pellet_cols) == 0:
+        other_cols = [col for col in df.columns if col not in meta_cols]
         print(f"  [FAIL] Could not identify pellet columns (expected columns labeled 1-20)")
-        print(f"      Non-metadata columns found: {pellet_cols[:10]}...")
+        print(f"      Non-metadata columns found: {other_cols[:10]}...")
         return None
     
-    # Use the identified pellet columns
-    pellet_cols = numeric_pellet_cols
-    
     # Split Tray Type/Number into separate columns
     # Handle formats like "F1", "P2", "E3", etc.
-    df['Tray_Type'] = df['Tray Type/Number'].str.extract(r'([A-Za-z]+)')
-    df['Tray_Number'] = df['Tray Type/Number'].str.extract(r'(\d+)').astype(int)
+    # Only a handful of distinct labels exist, so parse those and map back
+    tray_labels = df['Tray Type/Number']
+    labels = pd.Series(tray_labels.unique())
+    tray_type = pd.Series(labels.str.extract(r'([A-Za-z]+)', expand=False).to_numpy(), index=labels)
+    tray_number = pd.Series(labels.str.extract(r'(\d+)', expand=False).to_numpy(), index=labels)
+    df['Tray_Type'] = tray_labels.map(tray_type)
+    df['Tray_Number'] = tray_labels.map(tray_number).astype('int8')
+    
+    # Sort for readability. Sorting the sheet rows (one per tray) and then
+    # expanding each row in pellet order gives the same order as sorting the
+    # 20x longer result by pellet too.
+    df = df.sort_values(['Date', 'Animal', 'Tray_Type', 'Tray_Number'])
+    pellet_cols = sorted(pellet_cols, key=int)
     
     # Reshape from wide to long
     id_vars = ['Date', 'Animal', 'Sex', 'Weight', 'Tray_Type', 'Tray_Number']
     
-    long_df = df.melt(
-        id_vars=id_vars,
-        value_vars=pellet_cols,
-        var_name='Pellet_Number',
-        value_name='Score'
-    )
+    # Each sheet row becomes one row per pellet column. Repeating the id rows
+    # and raveling the pellet block row-major avoids melt's per-column copies
+    # and keeps unscored (NaN) pellets, unlike stack().
+    n_pellets = len(pellet_cols)
+    long_df = df[id_vars].iloc[np.repeat(np.arange(len(df)), n_pellets)].reset_index(drop=True)
     
-    # Convert Pellet_Number to integer (it might be string or int)
-    long_df['Pellet_Number'] = pd.to_numeric(long_df['Pellet_Number'], errors='coerce').astype(int)
+    # Column labels are 1-20 as int or string; convert the 20 labels, not every row
+    long_df['Pellet_Number'] = np.tile(pd.to_numeric(pd.Index(pellet_cols)).astype('int8'), len(df))
+    long_df['Score'] = downcast_scores(df[pellet_cols].to_numpy().ravel())
     
-    # Sort for readability
-    long_df = long_df.sort_values(['Date', 'Animal', 'Tray_Type', 'Tray_Number', 'Pellet_Number'])
+    # Few distinct values per column; categories are a fraction of object strings
+    long_df = long_df.astype({'Animal': 'category', 'Sex': 'category', 'Tray_Type': 'category'})
     
     return long_df
 
-def main():
-    print("=" * 60)
-    print("DATA REORGANIZATION SCRIPT")
-    print("=" * 60)
-    print("\n[!] IMPORTANT: Close all Excel files before running this script!")
-    print("=" * 60)
-    
-    # Find Excel files
-    excel_files = list_excel_files()
-    
-    if not excel_files:
-        print("\nNo Excel files found in current directory!")
-        return
-    
-    # Select file(s)
-    selected_files = get_user_selection(excel_files, "file")
-    
-    if not selected_files:
-        print("No files selected. Exiting.")
-        return
-    
-    # Process each selected file
-    all_data = []
-    
-    for file_path in selected_files:
+def select_sheets(file_paths):
+    """Prompt for the sheets to process in each file; returns (file, sheet) pairs"""
+    tasks = []
+    for file_path in file_paths:
         print(f"\n{'=' * 60}")
-        print(f"Processing file: {file_path}")
+        print(f"File: {file_path}")
         print('=' * 60)
         
-        # List sheets
-        sheet_names = list_sheets(file_path)
+        xl_file = open_workbook(file_path)
         
-        if sheet_names is None:
+        if xl_file is None:
             print(f"Skipping {file_path} due to access error.")
             continue
         
-        # Select sheets
-        selected_sheets = get_user_selection(sheet_names, "sheet")
+        selected_sheets = get_user_selection(xl_file.sheet_names, "sheet")
         
         if not selected_sheets:
             print(f"No sheets selected from {file_path}. Skipping.")
             continue
         
-        # Process each selected sheet
-        for sheet_name in selected_sheets:
-            print(f"\nProcessing sheet: {sheet_name}")
+        tasks.extend((file_path, sheet_name) for sheet_name in selected_sheets)
+    return tasks
+
+def process_sheet(file_path, sheet_name):
+    """Read and reshape one sheet; returns (sheet rows, long_df or None).
+
+    Module-level so it can run in a worker process. Each process opens a
+    given workbook once and reuses it for the rest of that file's sheets.
+    """
+    df = _workbook(file_path).parse(sheet_name, usecols=is_needed_column)
+    long_df = reorganize_sheet(df)
+    
+    if long_df is not None:
+        # Add source tracking
+        long_df['Source_File'] = file_path
+        long_df['Source_Sheet'] = sheet_name
+        long_df = long_df.astype({'Source_File': 'category',
+                                  'Source_Sheet': 'category'})
+    return len(df), long_df
+
+def iter_reorganized_sheets(tasks, max_workers=None):
+    """Yield each reshaped sheet in task order, reading sheets in parallel.
+
+    Sheets are independent, so with more than one they are parsed in a
+    process pool; a single sheet is handled inline to skip pool startup.
+    """
+    if len(tasks) > 1 and max_workers != 1:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        results = [executor.submit(process_sheet, *task) for task in tasks]
+    else:
+        executor = None
+        results = tasks
+    
+    try:
+        for (file_path, sheet_name), result in zip(tasks, results):
+            print(f"\nProcessing sheet: {sheet_name} ({file_path})")
             
             try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                long_df = reorganize_sheet(df)
+                if executor is None:
+                    n_rows, long_df = process_sheet(file_path, sheet_name)
+                else:
+                    n_rows, long_df = result.result()
                 
                 if long_df is not None:
-                    # Add source tracking
-                    long_df['Source_File'] = file_path
-                    long_df['Source_Sheet'] = sheet_name
-                    all_data.append(long_df)
-                    print(f"  [OK] Reshaped {len(df)} rows into {len(long_df)} rows")
+                    print(f"  [OK] Reshaped {n_rows} rows into {len(long_df)} rows")
+                    yield long_df
                 else:
                     print(f"  [FAIL] Failed to reshape {sheet_name}")
                     
             except Exception as e:
                 print(f"  [FAIL] Error processing {sheet_name}: {e}")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        close_workbooks()
+
+def main():
+    print("=" * 60)
+    print("DATA REORGANIZATION SCRIPT")
+    print("=" * 60)
+    print("\n[!] IMPORTANT: Close all Excel files before running this script!")
+    print("=" * 60)
     
-    # Combine all data
-    if all_data:
-        combined_df = pd.concat(all_data, ignore_index=True)
-        
-        # Save output
-        output_file = "reorganized_data_long_format.csv"
-        combined_df.to_csv(output_file, index=False)
-        
-        print(f"\n{'=' * 60}")
-        print(f"SUCCESS!")
-        print(f"{'=' * 60}")
-        print(f"Total rows processed: {len(combined_df)}")
-        print(f"Output saved to: {output_file}")
-        print(f"\nColumns in output:")
-        for col in combined_df.columns:
-            print(f"  - {col}")
-        
-        # Show preview
-        print(f"\nFirst few rows:")
-        print(combined_df.head(10).to_string())
-        
-    else:
+    # Find Excel files
+    excel_files = list_excel_files()
+    
+    if not excel_files:
+        print("\nNo Excel files found in current directory!")
+        return
+    
+    # Select file(s)
+    selected_files = get_user_selection(excel_files, "file")
+    
+    if not selected_files:
+        print("No files selected. Exiting.")
+        return
+    
+    # Stream each sheet to the output as it is reshaped, so the combined
+    # data never has to be held in memory at once
+    tasks = select_sheets(selected_files)
+    sheets = iter_reorganized_sheets(tasks)
+    first = next(sheets, None)
+    
+    if first is None:
         print("\nNo data was successfully processed.")
+        return
+    
+    output_file = "reorganized_data_long_format.csv"
+    with open(output_file, 'w', newline='', encoding='utf-8') as out:
+        first.to_csv(out, index=False)
+        total_rows = len(first)
+        for long_df in sheets:
+            long_df.to_csv(out, header=False, index=False)
+            total_rows += len(long_df)
+    
+    print(f"\n{'=' * 60}")
+    print(f"SUCCESS!")
+    print(f"{'=' * 60}")
+    print(f"Total rows processed: {total_rows}")
+    print(f"Output saved to: {output_file}")
+    print(f"\nColumns in output:")
+    for col in first.columns:
+        print(f"  - {col}")
+    
+    # Show preview
+    print(f"\nFirst few rows:")
+    print(first.head(10).reset_index(drop=True).to_string())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
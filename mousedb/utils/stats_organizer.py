@@ -1,8 +1,160 @@
 import pandas as pd
 import numpy as np
+import fnmatch
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+# Rust-backed Excel reader; much faster than openpyxl on large workbooks
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+EXCEL_ENGINE = 'calamine' if HAS_CALAMINE else None  # None = pandas default (openpyxl)
+
+# Pellet column labels as Excel may save them (int or str)
+_PELLET_LABELS = set(range(1, 21)) | {str(i) for i in range(1, 21)}
+
+# Every tracking-sheet column reorganize_data reads; others are never parsed
+_TRACKING_COLUMNS = {'Date', 'Animal', 'Sex', 'Weight', 'Weight %', 'Test_Phase',
+                     'Tray Type/Number'} | _PELLET_LABELS
+
+# Multi-threaded C++ CSV writer; quoting_style needs a recent pyarrow.
+# Nothing is quoted, as with to_csv; a value that would need quotes makes
+# the write fail and fall back to to_csv.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    _CSV_WRITE_OPTIONS = pacsv.WriteOptions(include_header=False, quoting_style='none')
+    HAS_PYARROW_CSV = True
+except (ImportError, TypeError):
+    HAS_PYARROW_CSV = False
+
+
+def _float_csv_strings(column):
+    """
+    Format a float column for CSV, writing whole numbers as to_csv does.
+
+    pyarrow writes 20.0 as "20", which reads back as an integer; whole
+    numbers below 1e16 get the ".0" suffix so float columns stay float.
+    """
+    whole = pc.and_(pc.equal(column, pc.floor(column)), pc.less(pc.abs(column), 1e16))
+    whole_strings = pc.binary_join_element_wise(
+        pc.cast(pc.cast(pc.if_else(whole, column, 0.0), pa.int64()), pa.string()), '.0', '')
+    return pc.if_else(whole, whole_strings, pc.cast(column, pa.string()))
+
+
+def _write_csv(df, path):
+    """
+    Write df to CSV without its index, using pyarrow's writer when available.
+
+    The file reads back with the same dtypes as one written by to_csv:
+    timestamp columns that are all midnight are written as plain dates, and
+    whole-number floats keep their ".0". Frames pyarrow cannot convert
+    (e.g. mixed-type object columns) or that need quoting fall back to to_csv.
+    """
+    if HAS_PYARROW_CSV:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            for i, field in enumerate(table.schema):
+                column = table.column(i)
+                if pa.types.is_timestamp(field.type) and pc.all(pc.equal(
+                        column, pc.floor_temporal(column, unit='day'))).as_py() is not False:
+                    table = table.set_column(i, field.name, pc.cast(column, pa.date32()))
+                elif pa.types.is_floating(field.type):
+                    table = table.set_column(i, field.name, _float_csv_strings(column))
+            with open(path, 'wb') as f:
+                # pyarrow quotes header names; write the header as to_csv does
+                f.write(df.iloc[:0].to_csv(index=False, lineterminator='\n').encode())
+                pacsv.write_csv(table, f, write_options=_CSV_WRITE_OPTIONS)
+            return
+        except pa.ArrowException:
+            pass
+    df.to_csv(path, index=False)
+
+
+def _as_read_from_csv(df):
+    """
+    Return df with the dtypes read_csv gives it once written by _write_csv.
+
+    Dates become 'YYYY-MM-DD' strings, labels plain strings (all-missing
+    columns float64 NaN), and integers int64, or float64 where values are
+    missing. Returns None for a frame read_csv may parse differently, such
+    as labels that look like numbers or timestamps with a time of day.
+    """
+    columns = {}
+    for name, col in df.items():
+        if pd.api.types.is_datetime64_any_dtype(col):
+            if not (col.dropna() == col.dropna().dt.normalize()).all():
+                return None
+            col = col.dt.strftime('%Y-%m-%d')
+        if pd.api.types.is_bool_dtype(col) or pd.api.types.is_numeric_dtype(col):
+            if pd.api.types.is_integer_dtype(col) and not col.hasnans:
+                columns[name] = col.astype(np.int64)
+            elif pd.api.types.is_bool_dtype(col) and not col.hasnans:
+                columns[name] = col.astype(bool)
+            else:
+                columns[name] = col.astype(np.float64)
+            continue
+        values = col.to_numpy(dtype=object, na_value=np.nan)
+        labels = col.dropna().astype(str)
+        if labels.empty:
+            columns[name] = np.full(len(col), np.nan)
+        elif pd.to_numeric(labels, errors='coerce').notna().any() or labels.isin(['True', 'False']).any():
+            return None
+        else:
+            # Inferred as read_csv infers: str on pandas 3, object before
+            columns[name] = pd.Series(values, index=col.index, name=name)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _pellet_fatigue(level1_df):
+    """
+    Per session pellet number: mean result, animals contributing, and the
+    proportion of each result, from the level 1 pellet table.
+
+    Session pellet numbers and results take only a few distinct values, so
+    everything is counted in one pass into small arrays indexed by their codes.
+    """
+    session_pellets = level1_df['Session_Pellet_Number']
+    scored = session_pellets.notna().to_numpy()
+    pellet_codes, pellet_numbers = pd.factorize(session_pellets[scored], sort=True)
+    result_values = level1_df['Pellet_Result'].to_numpy()[scored]
+    result_codes, results = pd.factorize(result_values, sort=True)
+    animal_codes, animals = pd.factorize(level1_df['Animal'][scored])
+    n_pellets, n_results = len(pellet_numbers), len(results)
+
+    # counts[pellet, result]
+    counts = np.bincount(pellet_codes * n_results + result_codes,
+                         minlength=n_pellets * n_results).reshape(n_pellets, n_results)
+    totals = counts.sum(axis=1)
+
+    # Which animals scored each pellet (missing animal IDs are not counted)
+    seen = np.zeros((n_pellets, len(animals)), dtype=bool)
+    known = animal_codes >= 0
+    seen[pellet_codes[known], animal_codes[known]] = True
+
+    fatigue = pd.DataFrame({
+        'Session_Pellet_Number': pellet_numbers,
+        'Average_Result': np.bincount(pellet_codes, weights=result_values,
+                                      minlength=n_pellets) / totals,
+        'Animals_Contributing': seen.sum(axis=1),
+    })
+
+    # Add proportions for each result type
+    for j, result in enumerate(results):
+        fatigue[f'Prop_Result_{int(result)}'] = counts[:, j] / totals
+
+    # Calculate skill ratio by pellet number
+    if 'Prop_Result_1' in fatigue.columns and 'Prop_Result_2' in fatigue.columns:
+        fatigue['Skill_Ratio_By_Pellet'] = fatigue['Prop_Result_1'] + fatigue['Prop_Result_2']
+    return fatigue
+
+
 class SCIDataReorganizer:
     def __init__(self):
         """
@@ -18,12 +170,6 @@ class SCIDataReorganizer:
             return self.pellet_columns_int
         return self.pellet_columns_str
 
-    def get_pellet_value(self, row, pellet_num, df):
-        """Get pellet value handling int vs str column names."""
-        if 1 in df.columns:
-            return row[pellet_num]  # int column
-        return row[str(pellet_num)]  # str column
-
     def parse_tray_info(self, tray_type):
         """
         Extract difficulty and repetition from tray type (e.g., 'P3' -> 'P', 3)
@@ -52,22 +198,33 @@ class SCIDataReorganizer:
         """
         Reorganize a single data file into the three analysis levels
         """
+        return self._reorganize(file_path, output_dir)[0]
+
+    def _reorganize(self, file_path, output_dir):
+        """
+        reorganize_data, also returning the level 2 frame it wrote, so the
+        unified file can be built without re-reading it.
+
+        Returns (outputs, level2_df); both are None if the sheet is missing.
+        """
         print(f"Processing: {file_path}")
         
         # Read file (Excel or CSV)
         try:
             if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
-                raw_data = pd.read_excel(file_path, sheet_name='3b_Manual_Tray')
+                raw_data = pd.read_excel(file_path, sheet_name='3b_Manual_Tray',
+                                         engine=EXCEL_ENGINE,
+                                         usecols=lambda col: col in _TRACKING_COLUMNS)
             else:
-                raw_data = pd.read_csv(file_path)
+                raw_data = pd.read_csv(file_path, usecols=lambda col: col in _TRACKING_COLUMNS)
         except ValueError as e:
             if "Worksheet named '3b_Manual_Tray' not found" in str(e):
                 print(f"ERROR: Sheet '3b_Manual_Tray' not found in {file_path}")
                 print("Available sheets:")
-                xl_file = pd.ExcelFile(file_path)
+                xl_file = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
                 for sheet in xl_file.sheet_names:
                     print(f"  - {sheet}")
-                return None
+                return None, None
             else:
                 raise e
         
@@ -75,86 +232,84 @@ class SCIDataReorganizer:
         raw_data['Date'] = pd.to_datetime(raw_data['Date'])
         
         # Parse tray information
-        tray_info = raw_data['Tray Type/Number'].apply(self.parse_tray_info)
-        raw_data['Tray_Difficulty'] = [info[0] for info in tray_info]
-        raw_data['Tray_Repetition'] = [info[1] for info in tray_info]
+        # Only a handful of distinct labels exist, so parse those and map back
+        tray_labels = raw_data['Tray Type/Number']
+        labels = tray_labels.unique()
+        tray_info = [self.parse_tray_info(label) for label in labels]
+        raw_data['Tray_Difficulty'] = tray_labels.map(
+            pd.Series([info[0] for info in tray_info], index=labels, dtype=object))
+        raw_data['Tray_Repetition'] = tray_labels.map(
+            pd.Series([info[1] for info in tray_info], index=labels))
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         base_name = Path(file_path).stem
         
+        # Per-tray identifying columns shared by the output levels
+        tray_ids = pd.DataFrame({
+            'Date': raw_data['Date'],
+            'Animal': raw_data['Animal'],
+            'Sex': raw_data.get('Sex'),
+            'Weight': raw_data['Weight'],
+            'Weight_Percent': raw_data.get('Weight %'),
+            'Test_Phase': raw_data.get('Test_Phase'),
+            'Tray_Difficulty': raw_data['Tray_Difficulty'],
+            'Tray_Repetition': raw_data['Tray_Repetition'],
+            'Tray_Type_Full': raw_data['Tray Type/Number'],
+        })
+        # Few distinct labels per column and small integers: store compactly
+        tray_ids = tray_ids.astype({
+            'Animal': 'category',
+            'Sex': 'category',
+            'Test_Phase': 'category',
+            'Tray_Difficulty': 'category',
+            'Tray_Repetition': 'Int16',
+            'Tray_Type_Full': 'category',
+        })
+        pellet_cols = self.get_pellet_columns(raw_data)
+        
         # LEVEL 1: Individual pellets (long format)
-        pellet_data = []
-        for idx, row in raw_data.iterrows():
-            for within_tray_pellet in range(1, 21):
-                pellet_result = self.get_pellet_value(row, within_tray_pellet, raw_data)
-                if pd.notna(pellet_result):
-                    session_pellet_num = self.calculate_session_pellet_number(
-                        row['Tray_Repetition'], within_tray_pellet)
-                    
-                    pellet_data.append({
-                        'Date': row['Date'],
-                        'Animal': row['Animal'],
-                        'Sex': row.get('Sex'),
-                        'Weight': row['Weight'],
-                        'Weight_Percent': row.get('Weight %'),
-                        'Test_Phase': row.get('Test_Phase'),
-                        'Tray_Difficulty': row['Tray_Difficulty'],
-                        'Tray_Repetition': row['Tray_Repetition'], 
-                        'Tray_Type_Full': row['Tray Type/Number'],
-                        'Within_Tray_Pellet': within_tray_pellet,
-                        'Session_Pellet_Number': session_pellet_num,
-                        'Pellet_Result': int(pellet_result)
-                    })
+        # One row per scored pellet, ordered by sheet row then pellet number
+        level1_df = pd.concat([tray_ids, raw_data[pellet_cols]], axis=1).melt(
+            id_vars=list(tray_ids.columns), value_vars=pellet_cols,
+            var_name='Within_Tray_Pellet', value_name='Pellet_Result', ignore_index=False)
+        level1_df = level1_df.dropna(subset=['Pellet_Result'])
+        level1_df = level1_df.sort_index(kind='stable').reset_index(drop=True)
+        level1_df['Within_Tray_Pellet'] = level1_df['Within_Tray_Pellet'].astype(int)
+        level1_df['Session_Pellet_Number'] = (
+            (level1_df['Tray_Repetition'] - 1) * 20 + level1_df['Within_Tray_Pellet']).astype('Int16')
+        level1_df['Pellet_Result'] = level1_df.pop('Pellet_Result').astype(np.int64)
         
-        level1_df = pd.DataFrame(pellet_data)
         level1_path = f"{output_dir}/{base_name}_level1_individual_pellets.csv"
-        level1_df.to_csv(level1_path, index=False)
+        _write_csv(level1_df, level1_path)
         
         # LEVEL 2: Tray summaries
-        pellet_cols = self.get_pellet_columns(raw_data)
-        tray_data = []
-        for idx, row in raw_data.iterrows():
-            pellet_results = [row[col] for col in pellet_cols if col in row.index and pd.notna(row[col])]
-            
-            miss_count = pellet_results.count(0)
-            displaced_count = pellet_results.count(1)
-            retrieved_count = pellet_results.count(2)
-            total_pellets = len(pellet_results)
-            
-            # Calculate ratios
-            skill_ratio = (displaced_count + retrieved_count) / total_pellets if total_pellets > 0 else 0
-            success_ratio = retrieved_count / total_pellets if total_pellets > 0 else 0
-            miss_ratio = miss_count / total_pellets if total_pellets > 0 else 0
-            displacement_ratio = displaced_count / total_pellets if total_pellets > 0 else 0
-            
-            tray_data.append({
-                'Date': row['Date'],
-                'Animal': row['Animal'],
-                'Sex': row.get('Sex'),
-                'Weight': row['Weight'],
-                'Weight_Percent': row.get('Weight %'),
-                'Test_Phase': row.get('Test_Phase'),
-                'Tray_Difficulty': row['Tray_Difficulty'],
-                'Tray_Repetition': row['Tray_Repetition'],
-                'Tray_Type_Full': row['Tray Type/Number'],
-                'Miss_Count': miss_count,
-                'Displaced_Count': displaced_count,
-                'Retrieved_Count': retrieved_count,
-                'Total_Pellets': total_pellets,
-                'Skill_Ratio': skill_ratio,
-                'Success_Ratio': success_ratio,
-                'Miss_Ratio': miss_ratio,
-                'Displacement_Ratio': displacement_ratio
-            })
+        # Count outcomes across each tray's pellet columns in one pass per outcome
+        scores = raw_data[pellet_cols].to_numpy(dtype=float)
+        miss_count = (scores == 0).sum(axis=1)
+        displaced_count = (scores == 1).sum(axis=1)
+        retrieved_count = (scores == 2).sum(axis=1)
+        total_pellets = (~np.isnan(scores)).sum(axis=1)
         
-        level2_df = pd.DataFrame(tray_data)
+        def ratio(count):
+            return np.divide(count, total_pellets, out=np.zeros(len(count)), where=total_pellets > 0)
+        
+        level2_df = tray_ids.assign(
+            Miss_Count=miss_count.astype(np.int64),
+            Displaced_Count=displaced_count.astype(np.int64),
+            Retrieved_Count=retrieved_count.astype(np.int64),
+            Total_Pellets=total_pellets.astype(np.int64),
+            Skill_Ratio=ratio(displaced_count + retrieved_count),
+            Success_Ratio=ratio(retrieved_count),
+            Miss_Ratio=ratio(miss_count),
+            Displacement_Ratio=ratio(displaced_count),
+        )
         level2_path = f"{output_dir}/{base_name}_level2_tray_summaries.csv"
-        level2_df.to_csv(level2_path, index=False)
+        _write_csv(level2_df, level2_path)
         
         # LEVEL 3: Daily averages
         # By difficulty
-        level3_by_difficulty = level2_df.groupby(['Date', 'Tray_Difficulty']).agg({
+        level3_by_difficulty = level2_df.groupby(['Date', 'Tray_Difficulty'], observed=True).agg({
             'Miss_Count': 'mean',
             'Displaced_Count': 'mean',
             'Retrieved_Count': 'mean',
@@ -180,7 +335,7 @@ class SCIDataReorganizer:
         
         level3_df = pd.concat([level3_by_difficulty, level3_overall], ignore_index=True)
         level3_path = f"{output_dir}/{base_name}_level3_daily_averages.csv"
-        level3_df.to_csv(level3_path, index=False)
+        _write_csv(level3_df, level3_path)
         
         # Pellet-level fatigue analysis
         if len(level1_df) == 0 or 'Session_Pellet_Number' not in level1_df.columns:
@@ -189,28 +344,12 @@ class SCIDataReorganizer:
                 'level1': level1_path,
                 'level2': level2_path,
                 'level3': level3_path,
-                'fatigue': None
-            }
+                'fatigue': None,
+            }, level2_df
 
-        fatigue_data = level1_df.groupby('Session_Pellet_Number').agg({
-            'Pellet_Result': 'mean',
-            'Animal': 'nunique'
-        }).rename(columns={'Pellet_Result': 'Average_Result', 'Animal': 'Animals_Contributing'})
-        
-        # Add proportions for each result type
-        result_props = level1_df.groupby(['Session_Pellet_Number', 'Pellet_Result']).size().unstack(fill_value=0)
-        result_props = result_props.div(result_props.sum(axis=1), axis=0)
-        result_props.columns = [f'Prop_Result_{int(col)}' for col in result_props.columns]
-        
-        fatigue_analysis = fatigue_data.merge(result_props, left_index=True, right_index=True, how='left')
-        
-        # Calculate skill ratio by pellet number
-        if 'Prop_Result_1' in fatigue_analysis.columns and 'Prop_Result_2' in fatigue_analysis.columns:
-            fatigue_analysis['Skill_Ratio_By_Pellet'] = fatigue_analysis['Prop_Result_1'] + fatigue_analysis['Prop_Result_2']
-        
-        fatigue_analysis = fatigue_analysis.reset_index()
+        fatigue_analysis = _pellet_fatigue(level1_df)
         fatigue_path = f"{output_dir}/{base_name}_pellet_fatigue.csv"
-        fatigue_analysis.to_csv(fatigue_path, index=False)
+        _write_csv(fatigue_analysis, fatigue_path)
         
         print(f"  Created: {level1_path}")
         print(f"  Created: {level2_path}")
@@ -221,8 +360,8 @@ class SCIDataReorganizer:
             'level1': level1_path,
             'level2': level2_path,
             'level3': level3_path,
-            'fatigue': fatigue_path
-        }
+            'fatigue': fatigue_path,
+        }, level2_df
 
 # Simple usage functions
 def reorganize_file(file_path, output_dir="reorganized_data"):
@@ -247,13 +386,51 @@ def _extract_cohort_number(filename):
     return None
 
 
-def _count_pellet_data(file_path):
+# Pellet counts per tracking file, stored under <input_dir>/generated
+_PELLET_COUNT_CACHE_NAME = '.pellet_count_cache.json'
+
+
+def _load_pellet_count_cache(cache_path):
+    """Load the pellet count cache, or an empty one if missing/unreadable."""
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_pellet_count_cache(cache_path, cache):
+    """Write the pellet count cache; a failed write only costs a re-read next run."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f, indent=1)
+    except OSError:
+        pass
+
+
+def _count_pellet_data(file_path, cache=None):
     """
     Count non-NaN pellet values in a tracking file.
     Used to determine which file version has actual data.
+
+    If a cache dict is given, a count stored for the same path, mtime and
+    size is returned without opening the workbook, and new counts are added.
     """
+    file_path = Path(file_path)
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return 0
+    key = str(file_path.resolve())
+    entry = (cache or {}).get(key)
+    if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+        return entry['count']
+
     try:
-        df = pd.read_excel(file_path, sheet_name='3b_Manual_Tray')
+        # Only the pellet columns are needed; skip parsing the rest
+        df = pd.read_excel(file_path, sheet_name='3b_Manual_Tray', engine=EXCEL_ENGINE,
+                           usecols=lambda col: col in _PELLET_LABELS)
         # Check for pellet columns (could be int or str)
         if 1 in df.columns:
             pellet_cols = list(range(1, 21))
@@ -262,11 +439,17 @@ def _count_pellet_data(file_path):
             pellet_cols = [c for c in pellet_cols if c in df.columns]
 
         if pellet_cols:
-            return df[pellet_cols].notna().sum().sum()
-        return 0
+            count = int(df[pellet_cols].notna().sum().sum())
+        else:
+            count = 0
     except Exception:
+        # Unreadable (e.g. locked) files are not cached
         return 0
 
+    if cache is not None:
+        cache[key] = {'mtime': stat.st_mtime, 'size': stat.st_size, 'count': count}
+    return count
+
 
 def discover_tracking_files(input_dir):
     """
@@ -300,6 +483,8 @@ def discover_tracking_files(input_dir):
 
     # Select best file for each cohort
     best_files = {}
+    cache_path = input_path / 'generated' / _PELLET_COUNT_CACHE_NAME
+    cache = None
     for cohort_num, files in sorted(cohort_files.items()):
         if len(files) == 1:
             best_files[cohort_num] = files[0]
@@ -307,9 +492,12 @@ def discover_tracking_files(input_dir):
             # Multiple versions exist - pick the one with most pellet data
             print(f"  CNT_{cohort_num:02d}: Found {len(files)} versions, checking for best...")
 
+            if cache is None:
+                cache = _load_pellet_count_cache(cache_path)
+
             file_scores = []
             for fpath in files:
-                pellet_count = _count_pellet_data(fpath)
+                pellet_count = _count_pellet_data(fpath, cache)
                 mtime = fpath.stat().st_mtime
                 file_scores.append((fpath, pellet_count, mtime))
 
@@ -325,45 +513,88 @@ def discover_tracking_files(input_dir):
                 marker = " <-- SELECTED" if fpath == best[0] else ""
                 print(f"    {fpath.name}: {pellet_count} pellet values{marker}")
 
+    if cache is not None:
+        _save_pellet_count_cache(cache_path, cache)
+
     return best_files
 
 
-def reorganize_directory(input_dir, file_pattern="*.xlsx", output_dir="reorganized_data"):
+def _reorganize_cohort_file(file_path, output_dir, keep_level2=False):
+    """
+    Reorganize one tracking file; module-level so it can run in a worker process.
+
+    Returns (outputs, level2_df). level2_df is None unless keep_level2 is
+    set, so the frame is only sent back from a worker when it is wanted.
+    """
+    outputs, level2_df = SCIDataReorganizer()._reorganize(file_path, output_dir)
+    return outputs, (level2_df if keep_level2 else None)
+
+
+def reorganize_directory(input_dir, file_pattern="*.xlsx", output_dir="reorganized_data",
+                         serial=False, max_workers=None):
     """
     Reorganize all tracking files in a directory.
 
     Automatically handles naming conflicts by selecting the file version
     with the most actual data for each cohort.
+
+    Cohorts are independent, so several are processed in a process pool
+    (max_workers defaults to the CPU count). Pass serial=True to process
+    them one at a time in this process, e.g. for debugging.
     """
-    reorganizer = SCIDataReorganizer()
-    input_path = Path(input_dir)
+    return _reorganize_directory(input_dir, output_dir, serial, max_workers)[0]
 
+
+def _reorganize_directory(input_dir, output_dir, serial=False, max_workers=None,
+                          keep_level2=False):
+    """
+    reorganize_directory, also returning {cohort ID: level2 DataFrame} for
+    the cohorts reorganized successfully when keep_level2 is set.
+    """
     # Use smart discovery for Connectome tracking files
     print("Discovering tracking files...")
     best_files = discover_tracking_files(input_dir)
 
     if not best_files:
         print("No Connectome tracking files found.")
-        return {}
+        return {}, {}
 
     print(f"\nProcessing {len(best_files)} cohorts:")
 
-    results = {}
-    for cohort_num, fpath in sorted(best_files.items()):
-        try:
-            result = reorganizer.reorganize_data(str(fpath), output_dir)
-            results[f"CNT_{cohort_num:02d}"] = {
-                'source_file': fpath.name,
-                'outputs': result
-            }
-        except Exception as e:
-            print(f"Error processing CNT_{cohort_num:02d} ({fpath.name}): {e}")
-            results[f"CNT_{cohort_num:02d}"] = {
-                'source_file': fpath.name,
-                'error': str(e)
-            }
+    cohorts = sorted(best_files.items())
+    if serial or len(cohorts) == 1:
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        futures = [executor.submit(_reorganize_cohort_file, str(fpath), output_dir, keep_level2)
+                   for _, fpath in cohorts]
 
-    return results
+    results = {}
+    level2_frames = {}
+    try:
+        for i, (cohort_num, fpath) in enumerate(cohorts):
+            try:
+                if executor is None:
+                    result, level2_df = _reorganize_cohort_file(str(fpath), output_dir, keep_level2)
+                else:
+                    result, level2_df = futures[i].result()
+                results[f"CNT_{cohort_num:02d}"] = {
+                    'source_file': fpath.name,
+                    'outputs': result
+                }
+                if level2_df is not None:
+                    level2_frames[f"CNT_{cohort_num:02d}"] = level2_df
+            except Exception as e:
+                print(f"Error processing CNT_{cohort_num:02d} ({fpath.name}): {e}")
+                results[f"CNT_{cohort_num:02d}"] = {
+                    'source_file': fpath.name,
+                    'error': str(e)
+                }
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return results, level2_frames
 
 
 def reorganize_all_cohorts(input_dir=None, output_dir="generated/reorganized"):
@@ -384,7 +615,7 @@ def reorganize_all_cohorts(input_dir=None, output_dir="generated/reorganized"):
     print("SCI Data Reorganizer - Processing All Cohorts")
     print("=" * 50)
 
-    results = reorganize_directory(input_dir, output_dir=output_dir)
+    results, level2_frames = _reorganize_directory(input_dir, output_dir, keep_level2=True)
 
     print("\n" + "=" * 50)
     print("Summary:")
@@ -405,8 +636,16 @@ def reorganize_all_cohorts(input_dir=None, output_dir="generated/reorganized"):
     print(f"\nSuccessfully processed: {success_count}/{len(results)} cohorts")
     print(f"Output directory: {output_dir}")
 
-    # Create unified file combining all cohorts
-    _create_unified_file(output_dir)
+    # Create unified file combining all cohorts, from the level2 frames
+    # just built rather than re-reading their CSVs. Cohorts that failed or
+    # were skipped this run (e.g. a workbook locked by Excel) keep their
+    # existing level2 file, as when the unified file is built from disk.
+    fallback = {cohort_num: f for cohort_num, f in _latest_level2_files(output_dir).items()
+                if f"CNT_{cohort_num:02d}" not in level2_frames}
+    for cohort_num, f in fallback.items():
+        print(f"  CNT_{cohort_num:02d}: using existing {f.name}")
+        level2_frames[f"CNT_{cohort_num:02d}"] = _read_level2_file(f)
+    _create_unified_file_from_frames(level2_frames, output_dir)
 
     return results
 
@@ -436,11 +675,9 @@ def get_unified_data(input_dir=None, force_rebuild=False):
     if not needs_rebuild:
         # Check if any source file is newer than unified output
         unified_mtime = unified_path.stat().st_mtime
-        for xlsx in input_dir.glob('Connectome_*_Animal_Tracking*.xlsx'):
-            if xlsx.name.startswith('~'):
-                continue
-            if xlsx.stat().st_mtime > unified_mtime:
-                print(f"Source file changed: {xlsx.name}")
+        for entry in _scan_files(input_dir, 'Connectome_*_Animal_Tracking*.xlsx'):
+            if entry.stat().st_mtime > unified_mtime:
+                print(f"Source file changed: {entry.name}")
                 needs_rebuild = True
                 break
 
@@ -448,35 +685,83 @@ def get_unified_data(input_dir=None, force_rebuild=False):
         print("Rebuilding unified data...")
         reorganize_all_cohorts(input_dir)
 
-    # Load and return the unified data
+    # Load and return the unified data, preferring the Parquet copy when it
+    # was written alongside the current CSV
     import pandas as pd
+    parquet_path = unified_path.with_suffix('.parquet')
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= unified_path.stat().st_mtime:
+        return pd.read_parquet(parquet_path)
     return pd.read_csv(unified_path)
 
 
+def _read_level2_file(f):
+    """Read one cohort's level2 tray summaries."""
+    # Parse dates while reading, rather than re-parsing the combined strings
+    return pd.read_csv(f, parse_dates=['Date'])
+
+
+def _latest_level2_files(output_dir):
+    """
+    Find one level2 tray summaries file per cohort in output_dir.
+
+    Files are keyed by the same cohort number used for discovery. Stale
+    copies (e.g. old Connectome_4_ names without a leading zero) map to the
+    same cohort; the newest file wins. Empty files are ignored.
+
+    Returns:
+        Dict mapping cohort number -> Path
+    """
+    level2_files = {}
+    for f in Path(output_dir).glob('*_level2_tray_summaries.csv'):
+        cohort_num = _extract_cohort_number(f.name)
+        stat = f.stat()
+        if cohort_num is None or stat.st_size <= 100:
+            continue
+        current = level2_files.get(cohort_num)
+        if current is None or stat.st_mtime > current[1]:
+            level2_files[cohort_num] = (f, stat.st_mtime)
+    return {cohort_num: f for cohort_num, (f, _) in level2_files.items()}
+
+
 def _create_unified_file(output_dir):
     """Create a single unified CSV combining all cohort level2 tray summaries."""
     output_path = Path(output_dir)
-
-    # Find all level2 files (skip old duplicates without leading zeros)
-    level2_files = sorted([
-        f for f in output_path.glob('*_level2_tray_summaries.csv')
-        if f.stat().st_size > 100 and not f.name.startswith('Connectome_4_')
-    ])
+    level2_files = _latest_level2_files(output_path)
 
     if not level2_files:
         print("No level2 files found to combine.")
         return None
 
-    all_dfs = []
-    for f in level2_files:
-        df = pd.read_csv(f)
-        # Extract cohort from filename
-        cohort = f.name.split('_')[1]
-        df['Cohort'] = f'CNT_{cohort}'
-        all_dfs.append(df)
+    cohorts = sorted(level2_files)
+    paths = [level2_files[cohort_num] for cohort_num in cohorts]
+
+    # pandas' C parser releases the GIL, so cohort files read concurrently
+    with ThreadPoolExecutor(max_workers=min(16, len(paths))) as executor:
+        frames = executor.map(_read_level2_file, paths)
+        level2_frames = {f"CNT_{cohort_num:02d}": df for cohort_num, df in zip(cohorts, frames)}
+
+    return _create_unified_file_from_frames(level2_frames, output_path)
+
+
+def _create_unified_file_from_frames(level2_frames, output_dir):
+    """
+    Create the unified CSV from level2 tray summaries already in memory.
+
+    Args:
+        level2_frames: Dict mapping cohort ID (e.g. 'CNT_01') -> level2 DataFrame
+        output_dir: The cohorts' output directory; the unified file goes in its parent
+    """
+    if not level2_frames:
+        print("No level2 data to combine.")
+        return None
+
+    all_dfs = [df.assign(Cohort=cohort) for cohort, df in sorted(level2_frames.items())]
+    return _write_unified_file(all_dfs, Path(output_dir))
+
 
+def _write_unified_file(all_dfs, output_path):
+    """Combine cohort level2 frames and write the unified CSV/Parquet next to output_path."""
     combined = pd.concat(all_dfs, ignore_index=True)
-    combined['Date'] = pd.to_datetime(combined['Date'])
 
     # Filter out incomplete entries (no pellet data)
     before_filter = len(combined)
@@ -495,7 +780,18 @@ def _create_unified_file(output_dir):
 
     # Save to parent directory
     unified_path = output_path.parent / 'all_cohorts_tray_summaries.csv'
-    combined.to_csv(unified_path, index=False)
+    as_read = _as_read_from_csv(combined)
+    _write_csv(combined if as_read is None else as_read, unified_path)
+
+    # Parquet copy reloads much faster. The CSV stays the canonical file for
+    # spreadsheet users and exporters, so the copy holds the CSV's schema:
+    # get_unified_data returns the same frame from either file.
+    try:
+        if as_read is None:
+            as_read = pd.read_csv(unified_path)
+        as_read.to_parquet(unified_path.with_suffix('.parquet'), compression='snappy', index=False)
+    except (ImportError, ValueError, TypeError) as e:
+        print(f"  Skipped Parquet copy: {e}")
 
     print()
     print("=" * 50)
@@ -510,12 +806,27 @@ def _create_unified_file(output_dir):
 # UNIFIED AUTO-UPDATE: Watches ALL data sources
 # =============================================================================
 
+def _scan_files(directory, pattern):
+    """
+    Yield os.DirEntry objects for files in directory whose names match pattern,
+    skipping Excel lock files (~$...).
+
+    Uses os.scandir so no Path object is built per entry; a missing directory
+    yields nothing.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.startswith('~') and fnmatch.fnmatch(entry.name, pattern):
+                    yield entry
+    except OSError:
+        return
+
+
 def _get_newest_mtime(directory, pattern):
     """Get newest modification time of files matching pattern."""
     newest = 0
-    for f in Path(directory).glob(pattern):
-        if f.name.startswith('~'):
-            continue
+    for f in _scan_files(directory, pattern):
         try:
             mtime = f.stat().st_mtime
             if mtime > newest:
@@ -525,6 +836,13 @@ def _get_newest_mtime(directory, pattern):
     return newest
 
 
+def _as_datetime(values):
+    """Convert to datetime, skipping the parse for columns that already are."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, cache=True)
+
+
 def get_pipeline_data(pipeline_dir=None, force_rebuild=False):
     """
     Get MouseReach pipeline reach data, auto-loading if sources changed.
@@ -615,9 +933,9 @@ def get_all_data(
             if 'Animal' in manual.columns:
                 manual['mouse_id'] = manual['Animal']
             if 'Date' in manual.columns:
-                manual['date'] = pd.to_datetime(manual['Date'])
+                manual['date'] = _as_datetime(manual['Date'])
             if 'date' in pipeline.columns:
-                pipeline['date'] = pd.to_datetime(pipeline['date'])
+                pipeline['date'] = _as_datetime(pipeline['date'])
 
             # Merge on mouse_id + date (session level)
             if 'mouse_id' in manual.columns and 'mouse_id' in pipeline.columns:
@@ -5,6 +5,8 @@ These validators are used by both the database schema and the GUI
 to provide consistent, user-friendly error messages.
 """
 
+import functools
+import json
 import re
 from datetime import date
 from typing import Dict, Tuple, Optional, List
@@ -67,8 +69,13 @@ def validate_project_code(value: str) -> Tuple[bool, str]:
     return True, ""
 
 
-# Compact animal ID format: letters followed by 4+ digits (e.g., CNT0115)
-_COMPACT_ID_PATTERN = re.compile(r'^([A-Za-z]+)(\d{2})(\d{2})$')
+# Compact animal ID format: letters followed by 4+ digits (e.g., CNT0115).
+# Matched against the uppercased ID, like SUBJECT_ID_PATTERN.
+_COMPACT_ID_PATTERN = re.compile(r'^([A-Z]+)(\d{2})(\d{2})$')
+
+# Bound match methods, looked up once for the per-ID loop in validate_animal_ids
+_subject_match = SUBJECT_ID_PATTERN.match
+_compact_match = _COMPACT_ID_PATTERN.match
 
 
 def compact_id_to_subject_id(animal_id: str) -> Optional[str]:
@@ -80,14 +87,15 @@ def compact_id_to_subject_id(animal_id: str) -> Optional[str]:
     if not animal_id:
         return None
     animal_id = animal_id.strip()
+    upper = animal_id.upper()
 
     # Already in database format?
-    if SUBJECT_ID_PATTERN.match(animal_id.upper()):
-        return animal_id.upper()
+    if _subject_match(upper):
+        return upper
 
-    match = _COMPACT_ID_PATTERN.match(animal_id)
+    match = _compact_match(upper)
     if match:
-        return f"{match.group(1).upper()}_{match.group(2)}_{match.group(3)}"
+        return f"{match.group(1)}_{match.group(2)}_{match.group(3)}"
 
     return None
 
@@ -110,7 +118,8 @@ def validate_animal_ids(animal_ids: List[str],
     """
     results = {}
 
-    # Convert all IDs to database format first
+    # Convert all IDs to database format first. compact_id_to_subject_id only
+    # returns IDs matching SUBJECT_ID_PATTERN, so one parse also validates.
     for raw_id in animal_ids:
         subject_id = compact_id_to_subject_id(raw_id)
         if subject_id is None:
@@ -120,19 +129,11 @@ def validate_animal_ids(animal_ids: List[str],
                 'message': f"Cannot parse animal ID: {raw_id}",
             }
         else:
-            valid, msg = validate_subject_id(subject_id)
-            if not valid:
-                results[raw_id] = {
-                    'exists': False,
-                    'subject_id': subject_id,
-                    'message': msg,
-                }
-            else:
-                results[raw_id] = {
-                    'exists': False,  # Will be updated below
-                    'subject_id': subject_id,
-                    'message': '',
-                }
+            results[raw_id] = {
+                'exists': False,  # Will be updated below
+                'subject_id': subject_id,
+                'message': '',
+            }
 
     # Query database for existence
     ids_to_check = [
@@ -146,15 +147,19 @@ def validate_animal_ids(animal_ids: List[str],
     try:
         from .database import init_database
         from .schema import Subject
+        from sqlalchemy import func, select
+
+        # Pass the IDs as one JSON parameter expanded by SQLite's json_each,
+        # rather than one bind parameter per ID (watcher batches can be large
+        # enough to hit SQLite's host-parameter limit)
+        id_list = func.json_each(json.dumps(ids_to_check)).table_valued('value')
 
         db = init_database(db_path)
         with db.session() as session:
-            existing = set(
-                row.subject_id for row in
-                session.query(Subject.subject_id)
-                .filter(Subject.subject_id.in_(ids_to_check))
-                .all()
-            )
+            existing = frozenset(session.execute(
+                select(Subject.subject_id)
+                .where(Subject.subject_id.in_(select(id_list.c.value)))
+            ).scalars())
 
         for raw_id, info in results.items():
             sid = info['subject_id']
@@ -269,6 +274,17 @@ def validate_surgery_type(value: str) -> Tuple[bool, str]:
 # SESSION VALIDATORS
 # =============================================================================
 
+@functools.lru_cache(maxsize=None)
+def _timeline_phases() -> Dict[int, str]:
+    """TIMELINE phase names keyed by day offset, built on first use."""
+    from .schema import TIMELINE
+
+    phases = {}
+    for offset, phase, _, _ in TIMELINE:
+        phases.setdefault(offset, phase)
+    return phases
+
+
 def validate_session_date(value: date, cohort_start_date: date,
                           valid_phases: List[str]) -> Tuple[bool, str, Optional[str]]:
     """
@@ -282,8 +298,6 @@ def validate_session_date(value: date, cohort_start_date: date,
     Returns:
         (is_valid, error_message, phase_name)
     """
-    from .schema import TIMELINE
-
     if value is None:
         return False, "Session date is required", None
 
@@ -293,9 +307,9 @@ def validate_session_date(value: date, cohort_start_date: date,
     day_offset = (value - cohort_start_date).days
 
     # Find matching phase
-    for offset, phase, _, _ in TIMELINE:
-        if offset == day_offset:
-            return True, "", phase
+    phase = _timeline_phases().get(day_offset)
+    if phase is not None:
+        return True, "", phase
 
     return False, f"Day {day_offset} is not a valid testing day (recovery period?)", None
 
@@ -327,10 +341,11 @@ def validate_pellet_grid(scores: List[List[int]], expected_trays: int = 4,
             errors.append(f"Tray {tray_idx + 1}: Expected {pellets_per_tray} pellets, got {len(tray_scores)}")
 
         for pellet_idx, score in enumerate(tray_scores):
-            if score is not None:
-                valid, msg = validate_pellet_score(score)
-                if not valid:
-                    errors.append(f"Tray {tray_idx + 1}, Pellet {pellet_idx + 1}: {msg}")
+            # Same test as validate_pellet_score, inlined; only bad cells
+            # pay for the call that builds the message
+            if score is not None and score not in (0, 1, 2):
+                _, msg = validate_pellet_score(score)
+                errors.append(f"Tray {tray_idx + 1}, Pellet {pellet_idx + 1}: {msg}")
 
     return len(errors) == 0, errors
 
@@ -349,7 +364,9 @@ def validate_import_row(row: dict, required_fields: List[str]) -> Tuple[bool, Li
     errors = []
 
     for field in required_fields:
-        if field not in row or row[field] is None or str(row[field]).strip() == '':
+        value = row.get(field)
+        # Only strings can be blank; other values are present unless None
+        if value is None or (isinstance(value, str) and not value.strip()):
             errors.append(f"Missing required field: {field}")
 
     return len(errors) == 0, errors
@@ -376,49 +393,97 @@ def compute_manual_summary(session, cohort_id: str) -> list:
     Returns:
         List of dicts: [{subject_id, date, retrieved_pct, contacted_pct, total_pellets}, ...]
     """
-    from .schema import PelletScore, Subject
-    from sqlalchemy import func, case, Integer
+    rows = session.execute(_session_percentages_select(cohort_id))
 
-    # Get all subjects in this cohort
-    subjects = session.query(Subject).filter_by(cohort_id=cohort_id).all()
-    subject_ids = [s.subject_id for s in subjects]
+    return [
+        {
+            'subject_id': row.subject_id,
+            'date': row.session_date,
+            'retrieved_pct': row.retrieved_pct,
+            'contacted_pct': row.contacted_pct,
+            'total_pellets': row.total,
+        }
+        for row in rows
+    ]
 
-    if not subject_ids:
-        return []
 
-    results = []
+def _session_percentages_select(cohort_id: str):
+    """Select retrieved/contacted percentages per (subject_id, session_date) in a cohort.
 
-    # Query pellet scores grouped by subject and date
-    # Use CASE WHEN instead of func.cast for SQLite compatibility
-    retrieved_count = func.sum(case((PelletScore.score == 2, 1), else_=0))
-    contacted_count = func.sum(case((PelletScore.score > 0, 1), else_=0))
+    Shared by compute_manual_summary and compute_phase_stats. The division
+    happens in SQL, matching (count / total) * 100 in Python. A session is
+    scored under one phase, so test_phase is aggregated rather than grouped by.
+    """
+    from .schema import PelletScore, Subject
+    from sqlalchemy import func, case, select
+
+    # Use CASE WHEN instead of func.cast for SQLite compatibility; summing
+    # 1.0 makes the division below floating point
+    retrieved_count = func.sum(case((PelletScore.score == 2, 1.0), else_=0.0))
+    contacted_count = func.sum(case((PelletScore.score > 0, 1.0), else_=0.0))
+    total = func.count(PelletScore.id)
+    subject_ids = select(Subject.subject_id).where(Subject.cohort_id == cohort_id)
 
-    rows = (
-        session.query(
+    return (
+        select(
             PelletScore.subject_id,
             PelletScore.session_date,
-            func.count(PelletScore.id).label('total'),
-            retrieved_count.label('retrieved'),
-            contacted_count.label('contacted'),
+            func.max(PelletScore.test_phase).label('test_phase'),
+            total.label('total'),
+            (retrieved_count / total * 100).label('retrieved_pct'),
+            (contacted_count / total * 100).label('contacted_pct'),
         )
-        .filter(PelletScore.subject_id.in_(subject_ids))
+        .where(PelletScore.subject_id.in_(subject_ids))
         .group_by(PelletScore.subject_id, PelletScore.session_date)
-        .all()
     )
 
-    for row in rows:
-        total = row.total or 0
-        if total == 0:
-            continue
-        results.append({
-            'subject_id': row.subject_id,
-            'date': row.session_date,
-            'retrieved_pct': (row.retrieved or 0) / total * 100,
-            'contacted_pct': (row.contacted or 0) / total * 100,
-            'total_pellets': total,
-        })
 
-    return results
+# Maps test_phase prefixes to summary category names for compute_phase_stats
+# Handles both underscore format (CNT_01) and space format (CNT_02)
+PHASE_MAP = {
+    # Underscore format (CNT_01 style)
+    'Training_Flat': 'Flat Training',
+    'Training_Pillar': 'Pillar Training',
+    'Pre-Injury_Test': 'Last 3',
+    'Post-Injury_Test_1': 'Post injury 1',
+    'Post-Injury_Test_2': 'Post Injury 2-4',
+    'Post-Injury_Test_3': 'Post Injury 2-4',
+    'Post-Injury_Test_4': 'Post Injury 2-4',
+    'Rehab_Easy': 'Rehab Easy',
+    'Rehab_Flat': 'Rehab Flat',
+    'Rehab_Pillar': 'Rehab Pillar',
+    # Space format (CNT_02 style)
+    'Flat Training': 'Flat Training',
+    'Pillar Training': 'Pillar Training',
+    'Pre-Injury Test': 'Last 3',
+    'Post-Injury Test 1': 'Post injury 1',
+    'Post-Injury Test 2': 'Post Injury 2-4',
+    'Post-Injury Test 3': 'Post Injury 2-4',
+    'Post-Injury Test 4': 'Post Injury 2-4',
+    'Rehab Easy': 'Rehab Easy',
+    'Rehab Flat': 'Rehab Flat',
+    'Rehab Pillar': 'Rehab Pillar',
+    # Generic rehab (CNT_01 style where rehab isn't split by tray type)
+    'Rehab_': 'Rehab',
+}
+
+# Longer prefixes first for specificity; sorted once at import
+_PHASE_PREFIXES = tuple(sorted(PHASE_MAP.items(), key=lambda item: len(item[0]), reverse=True))
+
+
+def _phase_group_case(test_phase):
+    """SQL CASE mapping a test_phase column to its summary phase group.
+
+    Prefixes are compared with substr rather than LIKE, which in SQLite is
+    case-insensitive and treats '_' as a wildcard.
+    """
+    from sqlalchemy import case, func
+
+    return case(
+        *((func.substr(test_phase, 1, len(prefix)) == prefix, group)
+          for prefix, group in _PHASE_PREFIXES),
+        else_='Unknown',
+    )
 
 
 def compute_phase_stats(session, cohort_id: str) -> list:
@@ -444,100 +509,31 @@ def compute_phase_stats(session, cohort_id: str) -> list:
     Returns:
         List of dicts: [{subject_id, phase, retrieved_pct, contacted_pct}, ...]
     """
-    from .schema import PelletScore, Subject
-    from collections import defaultdict
-
-    # Maps test_phase prefixes to summary category names
-    # Handles both underscore format (CNT_01) and space format (CNT_02)
-    PHASE_MAP = {
-        # Underscore format (CNT_01 style)
-        'Training_Flat': 'Flat Training',
-        'Training_Pillar': 'Pillar Training',
-        'Pre-Injury_Test': 'Last 3',
-        'Post-Injury_Test_1': 'Post injury 1',
-        'Post-Injury_Test_2': 'Post Injury 2-4',
-        'Post-Injury_Test_3': 'Post Injury 2-4',
-        'Post-Injury_Test_4': 'Post Injury 2-4',
-        'Rehab_Easy': 'Rehab Easy',
-        'Rehab_Flat': 'Rehab Flat',
-        'Rehab_Pillar': 'Rehab Pillar',
-        # Space format (CNT_02 style)
-        'Flat Training': 'Flat Training',
-        'Pillar Training': 'Pillar Training',
-        'Pre-Injury Test': 'Last 3',
-        'Post-Injury Test 1': 'Post injury 1',
-        'Post-Injury Test 2': 'Post Injury 2-4',
-        'Post-Injury Test 3': 'Post Injury 2-4',
-        'Post-Injury Test 4': 'Post Injury 2-4',
-        'Rehab Easy': 'Rehab Easy',
-        'Rehab Flat': 'Rehab Flat',
-        'Rehab Pillar': 'Rehab Pillar',
-        # Generic rehab (CNT_01 style where rehab isn't split by tray type)
-        'Rehab_': 'Rehab',
-    }
-
-    def get_phase_group(test_phase: str) -> str:
-        """Map individual test phase to summary phase group."""
-        if not test_phase:
-            return 'Unknown'
-        # Try exact prefix match (longer prefixes first for specificity)
-        for prefix in sorted(PHASE_MAP.keys(), key=len, reverse=True):
-            if test_phase.startswith(prefix):
-                return PHASE_MAP[prefix]
-        return 'Unknown'
-
-    # First compute per-session summaries
-    session_summaries = compute_manual_summary(session, cohort_id)
-
-    # Need to get test_phase for each (subject_id, date) pair
-    # Query distinct (subject_id, session_date, test_phase) from pellet_scores
-    subjects = session.query(Subject).filter_by(cohort_id=cohort_id).all()
-    subject_ids = [s.subject_id for s in subjects]
-
-    if not subject_ids:
-        return []
-
-    # Get phase for each session
-    from .schema import PelletScore
-    phase_rows = (
-        session.query(
-            PelletScore.subject_id,
-            PelletScore.session_date,
-            PelletScore.test_phase,
+    from sqlalchemy import func, select
+
+    per_session = _session_percentages_select(cohort_id).subquery()
+
+    # Mean of the session percentages per (subject_id, phase_group)
+    phase_group = _phase_group_case(per_session.c.test_phase)
+    rows = session.execute(
+        select(
+            per_session.c.subject_id,
+            phase_group.label('phase'),
+            func.avg(per_session.c.retrieved_pct).label('retrieved_pct'),
+            func.avg(per_session.c.contacted_pct).label('contacted_pct'),
         )
-        .filter(PelletScore.subject_id.in_(subject_ids))
-        .distinct()
-        .all()
+        .group_by(per_session.c.subject_id, phase_group)
     )
 
-    # Build lookup: (subject_id, date) -> test_phase
-    phase_lookup = {}
-    for pr in phase_rows:
-        key = (pr.subject_id, pr.session_date)
-        phase_lookup[key] = pr.test_phase
-
-    # Group session summaries by (subject_id, phase_group)
-    grouped = defaultdict(lambda: {'retrieved_pcts': [], 'contacted_pcts': []})
-
-    for summary in session_summaries:
-        key = (summary['subject_id'], summary['date'])
-        test_phase = phase_lookup.get(key, '')
-        phase_group = get_phase_group(test_phase)
-
-        group_key = (summary['subject_id'], phase_group)
-        grouped[group_key]['retrieved_pcts'].append(summary['retrieved_pct'])
-        grouped[group_key]['contacted_pcts'].append(summary['contacted_pct'])
-
-    # Compute means
     results = []
-    for (subject_id, phase_group), data in grouped.items():
-        if phase_group == 'Unknown':
+    for row in rows:
+        if row.phase == 'Unknown':
             continue
         results.append({
-            'subject_id': subject_id,
-            'phase': phase_group,
-            'retrieved_pct': sum(data['retrieved_pcts']) / len(data['retrieved_pcts']) if data['retrieved_pcts'] else 0,
-            'contacted_pct': sum(data['contacted_pcts']) / len(data['contacted_pcts']) if data['contacted_pcts'] else 0,
+            'subject_id': row.subject_id,
+            'phase': row.phase,
+            'retrieved_pct': row.retrieved_pct,
+            'contacted_pct': row.contacted_pct,
         })
 
     return results
@@ -569,6 +565,7 @@ def validate_against_archive(session, cohort_id: str, tolerance: float = 0.5) ->
         }
     """
     from .schema import ArchivedSummary
+    from sqlalchemy import select
 
     report = {
         'cohort_id': cohort_id,
@@ -585,20 +582,25 @@ def validate_against_archive(session, cohort_id: str, tolerance: float = 0.5) ->
         computed_lookup[(s['subject_id'], s['date'], 'retrieved_pct')] = s['retrieved_pct']
         computed_lookup[(s['subject_id'], s['date'], 'contacted_pct')] = s['contacted_pct']
 
-    # Get archived values for 3c sheets
-    archived_3c = (
-        session.query(ArchivedSummary)
-        .filter(
+    # Get archived values for 3c sheets (just the compared columns; rows
+    # missing any of them are skipped in SQL rather than loaded)
+    archived_3c = session.execute(
+        select(
+            ArchivedSummary.subject_id,
+            ArchivedSummary.date,
+            ArchivedSummary.metric_name,
+            ArchivedSummary.metric_value,
+        )
+        .where(
             ArchivedSummary.cohort_id == cohort_id,
             ArchivedSummary.sheet_name.in_(['3c_Manual_Summary', '3d_Manual_Summary - survivors']),
+            ArchivedSummary.metric_value.is_not(None),
+            ArchivedSummary.date.is_not(None),
+            ArchivedSummary.subject_id.is_not(None),
         )
-        .all()
     )
 
     for arch in archived_3c:
-        if arch.metric_value is None or arch.date is None or arch.subject_id is None:
-            continue
-
         key = (arch.subject_id, arch.date, arch.metric_name)
         computed_val = computed_lookup.get(key)
 
@@ -630,19 +632,23 @@ def validate_against_archive(session, cohort_id: str, tolerance: float = 0.5) ->
         stats_lookup[(s['subject_id'], s['phase'], 'retrieved_pct')] = s['retrieved_pct']
         stats_lookup[(s['subject_id'], s['phase'], 'contacted_pct')] = s['contacted_pct']
 
-    archived_stats = (
-        session.query(ArchivedSummary)
-        .filter(
+    archived_stats = session.execute(
+        select(
+            ArchivedSummary.subject_id,
+            ArchivedSummary.phase,
+            ArchivedSummary.metric_name,
+            ArchivedSummary.metric_value,
+        )
+        .where(
             ArchivedSummary.cohort_id == cohort_id,
             ArchivedSummary.sheet_name == '7_Stats',
+            ArchivedSummary.metric_value.is_not(None),
+            ArchivedSummary.phase.is_not(None),
+            ArchivedSummary.subject_id.is_not(None),
         )
-        .all()
     )
 
     for arch in archived_stats:
-        if arch.metric_value is None or arch.phase is None or arch.subject_id is None:
-            continue
-
         key = (arch.subject_id, arch.phase, arch.metric_name)
         computed_val = stats_lookup.get(key)
 
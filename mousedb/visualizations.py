@@ -24,6 +24,8 @@ import matplotlib.dates as mdates
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 
+from sqlalchemy import select
+
 from .database import get_db
 from .schema import Subject, PelletScore, Weight, Surgery, Cohort, INJURY_DAY
 from .stats import calculate_daily_stats, calculate_subject_summary
@@ -75,87 +77,79 @@ def get_cohort_data(cohort_id: str, db=None) -> Dict[str, pd.DataFrame]:
     db = db or get_db()
 
     with db.session() as session:
-        # Get subjects
-        subjects = session.query(Subject).filter(
-            Subject.cohort_id == cohort_id
-        ).all()
+        # Each table is read straight into typed columns with pd.read_sql,
+        # selecting only the columns kept; no ORM objects or per-row dicts
+        conn = session.connection()
 
-        subject_ids = [s.subject_id for s in subjects]
+        # Get subjects
+        subjects_df = pd.read_sql(
+            select(
+                Subject.subject_id, Subject.sex, Subject.is_active, Subject.date_of_death,
+            ).where(Subject.cohort_id == cohort_id),
+            conn,
+        )
 
-        subjects_df = pd.DataFrame([{
-            'subject_id': s.subject_id,
-            'sex': s.sex,
-            'is_active': s.is_active,
-            'date_of_death': s.date_of_death,
-        } for s in subjects])
+        subject_ids = subjects_df['subject_id'].tolist()
 
         # Get weights
-        weights = session.query(Weight).filter(
-            Weight.subject_id.in_(subject_ids)
-        ).all()
-
-        weights_df = pd.DataFrame([{
-            'subject_id': w.subject_id,
-            'date': w.date,
-            'weight_grams': w.weight_grams,
-            'weight_percent': w.weight_percent,
-        } for w in weights])
+        weights_df = pd.read_sql(
+            select(
+                Weight.subject_id, Weight.date, Weight.weight_grams, Weight.weight_percent,
+            ).where(Weight.subject_id.in_(subject_ids)),
+            conn,
+        )
 
         # Get pellet scores
-        pellets = session.query(PelletScore).filter(
-            PelletScore.subject_id.in_(subject_ids)
-        ).all()
-
-        pellets_df = pd.DataFrame([{
-            'subject_id': p.subject_id,
-            'date': p.session_date,
-            'test_phase': p.test_phase,
-            'tray_type': p.tray_type,
-            'tray_number': p.tray_number,
-            'pellet_number': p.pellet_number,
-            'score': p.score,
-        } for p in pellets])
+        pellets_df = pd.read_sql(
+            select(
+                PelletScore.subject_id,
+                PelletScore.session_date.label('date'),
+                PelletScore.test_phase,
+                PelletScore.tray_type,
+                PelletScore.tray_number,
+                PelletScore.pellet_number,
+                PelletScore.score,
+            ).where(PelletScore.subject_id.in_(subject_ids)),
+            conn,
+        )
+        # Scores are 0-2, trays 1-4 and pellets 1-20 (all NOT NULL): int8, not int64
+        pellets_df = pellets_df.astype({'tray_number': 'int8', 'pellet_number': 'int8', 'score': 'int8'})
 
         # Get surgeries
-        surgeries = session.query(Surgery).filter(
-            Surgery.subject_id.in_(subject_ids)
-        ).all()
-
-        surgeries_df = pd.DataFrame([{
-            'subject_id': s.subject_id,
-            'surgery_date': s.surgery_date,
-            'surgery_type': s.surgery_type,
-            'force_kdyn': s.force_kdyn,
-            'displacement_um': s.displacement_um,
-            'velocity_mm_s': s.velocity_mm_s,
-        } for s in surgeries])
-
-        # Calculate session summaries
-        sessions_data = []
-        if not pellets_df.empty:
-            for (subj, dt), group in pellets_df.groupby(['subject_id', 'date']):
-                total = len(group)
-                retrieved = (group['score'] == 2).sum()
-                displaced = (group['score'] == 1).sum()
-                miss = (group['score'] == 0).sum()
-                contacted = retrieved + displaced
-
-                sessions_data.append({
-                    'subject_id': subj,
-                    'date': dt,
-                    'test_phase': group['test_phase'].iloc[0],
-                    'tray_type': group['tray_type'].iloc[0],
-                    'n_trays': group['tray_number'].nunique(),
-                    'n_pellets': total,
-                    'retrieved': retrieved,
-                    'displaced': displaced,
-                    'miss': miss,
-                    'contacted': contacted,
-                    'retrieved_pct': 100 * retrieved / total if total > 0 else 0,
-                    'contacted_pct': 100 * contacted / total if total > 0 else 0,
-                })
-
-        sessions_df = pd.DataFrame(sessions_data)
+        surgeries_df = pd.read_sql(
+            select(
+                Surgery.subject_id,
+                Surgery.surgery_date,
+                Surgery.surgery_type,
+                Surgery.force_kdyn,
+                Surgery.displacement_um,
+                Surgery.velocity_mm_s,
+            ).where(Surgery.subject_id.in_(subject_ids)),
+            conn,
+        )
+
+        # Calculate session summaries, one row per (subject_id, date)
+        session_keys = ['subject_id', 'date']
+        score = pellets_df['score']
+        sessions_df = pellets_df.assign(
+            retrieved=score == 2, displaced=score == 1, miss=score == 0,
+        ).groupby(session_keys).agg(
+            n_trays=('tray_number', 'nunique'),
+            n_pellets=('score', 'size'),
+            retrieved=('retrieved', 'sum'),
+            displaced=('displaced', 'sum'),
+            miss=('miss', 'sum'),
+        )
+        # Phase and tray type come from each session's first row, even if null
+        first_rows = pellets_df.drop_duplicates(session_keys).set_index(session_keys)
+        sessions_df = sessions_df.join(first_rows[['test_phase', 'tray_type']]).reset_index()
+        sessions_df['contacted'] = sessions_df['retrieved'] + sessions_df['displaced']
+        sessions_df['retrieved_pct'] = 100 * sessions_df['retrieved'] / sessions_df['n_pellets']
+        sessions_df['contacted_pct'] = 100 * sessions_df['contacted'] / sessions_df['n_pellets']
+        sessions_df = sessions_df[[
+            'subject_id', 'date', 'test_phase', 'tray_type', 'n_trays', 'n_pellets',
+            'retrieved', 'displaced', 'miss', 'contacted', 'retrieved_pct', 'contacted_pct',
+        ]]
 
         return {
             'subjects': subjects_df,
@@ -376,11 +370,10 @@ def plot_pellet_heatmap(cohort_id: str, subject_id: Optional[str] = None,
     heatmap_data = np.zeros((4, 20))
     counts = np.zeros((4, 20))
 
-    for _, row in pellets.iterrows():
-        tray_idx = row['tray_number'] - 1
-        pellet_idx = row['pellet_number'] - 1
-        heatmap_data[tray_idx, pellet_idx] += (row['score'] == 2)
-        counts[tray_idx, pellet_idx] += 1
+    # Accumulate every pellet at once; same indexing as a per-row loop
+    position = (pellets['tray_number'].to_numpy() - 1, pellets['pellet_number'].to_numpy() - 1)
+    np.add.at(heatmap_data, position, pellets['score'].to_numpy() == 2)
+    np.add.at(counts, position, 1)
 
     # Convert to percentages
     with np.errstate(divide='ignore', invalid='ignore'):
@@ -545,13 +538,10 @@ def plot_recovery_trajectory(cohort_id: str, metric: str = 'retrieved_pct',
 
     injury_dates = contusion.set_index('subject_id')['surgery_date'].to_dict()
 
-    # Calculate DPI for each session
+    # Calculate DPI for each session; animals without an injury date get NaN
     sessions = sessions.copy()
-    sessions['dpi'] = sessions.apply(
-        lambda row: (row['date'] - injury_dates.get(row['subject_id'], row['date'])).days
-        if row['subject_id'] in injury_dates else None,
-        axis=1
-    )
+    injury = pd.to_datetime(sessions['subject_id'].map(injury_dates))
+    sessions['dpi'] = (pd.to_datetime(sessions['date']) - injury).dt.days
     sessions = sessions.dropna(subset=['dpi'])
     sessions['dpi'] = sessions['dpi'].astype(int)
 
@@ -634,16 +624,13 @@ def calculate_cohort_statistics(cohort_id: str, db=None) -> Dict[str, Any]:
         if not contusion.empty:
             injury_dates = contusion.set_index('subject_id')['surgery_date'].to_dict()
 
-            def classify_session(row):
-                injury_date = injury_dates.get(row['subject_id'])
-                if injury_date is None:
-                    return 'unknown'
-                if row['date'] < injury_date:
-                    return 'pre_injury'
-                else:
-                    return 'post_injury'
-
-            sessions['injury_phase'] = sessions.apply(classify_session, axis=1)
+            # Classify each session relative to its animal's injury date
+            injury = pd.to_datetime(sessions['subject_id'].map(injury_dates))
+            before_injury = pd.to_datetime(sessions['date']) < injury
+            sessions['injury_phase'] = np.where(
+                injury.isna(), 'unknown',
+                np.where(before_injury, 'pre_injury', 'post_injury'),
+            )
 
             pre = sessions[sessions['injury_phase'] == 'pre_injury']['retrieved_pct']
             post = sessions[sessions['injury_phase'] == 'post_injury']['retrieved_pct']
@@ -0,0 +1,121 @@
+"""
+Tests for mousedb.lab_figures: its caches and the data shaping behind figures.
+
+disk_cached pickles loader results until their source files change; these
+tests point CACHE_DIR at a temp directory. render_key / is_up_to_date /
+save_fig skip re-rendering a figure whose inputs are unchanged.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from mousedb import lab_figures
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setattr(lab_figures, 'CACHE_DIR', cache_dir)
+    return cache_dir
+
+
+def _counting_loader(source, result=lambda path: pd.read_csv(path)):
+    calls = []
+
+    @lab_figures.disk_cached(source)
+    def load():
+        calls.append(1)
+        return result(source)
+
+    return load, calls
+
+
+def test_disk_cached_reuses_result_until_source_changes(tmp_path, cache_dir):
+    source = tmp_path / 'counts.csv'
+    pd.DataFrame({'region': ['a', 'b'], 'cells': [1, 2]}).to_csv(source, index=False)
+    load, calls = _counting_loader(source)
+
+    first = load()
+    pd.testing.assert_frame_equal(load(), first)
+    assert len(calls) == 1
+    assert (cache_dir / 'load.pkl').exists()
+
+    pd.DataFrame({'region': ['a', 'b', 'c'], 'cells': [1, 2, 3]}).to_csv(source, index=False)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert len(load()) == 3
+    assert len(calls) == 2
+
+
+def test_disk_cached_keys_on_arguments(tmp_path, cache_dir):
+    db_a, db_b = tmp_path / 'a.db', tmp_path / 'b.db'
+    db_a.write_bytes(b'a')
+    db_b.write_bytes(b'bb')
+
+    @lab_figures.disk_cached()
+    def load_size(db_path):
+        return db_path.stat().st_size
+
+    assert load_size(db_a) == 1
+    assert load_size(db_b) == 2
+    assert load_size(db_a) == 1
+
+
+def test_disk_cached_does_not_keep_none(tmp_path, cache_dir):
+    source = tmp_path / 'missing.csv'
+    load, calls = _counting_loader(source, result=lambda path: None)
+    assert load() is None
+    assert load() is None
+    assert len(calls) == 2
+    assert not (cache_dir / 'load.pkl').exists()
+
+
+def test_disk_cached_ignores_a_corrupt_cache_file(tmp_path, cache_dir):
+    source = tmp_path / 'counts.csv'
+    pd.DataFrame({'cells': [1]}).to_csv(source, index=False)
+    load, calls = _counting_loader(source)
+    cache_dir.mkdir()
+    (cache_dir / 'load.pkl').write_bytes(b'not a pickle')
+    assert load()['cells'].tolist() == [1]
+    assert len(calls) == 1
+
+
+def test_render_key_depends_on_name_and_inputs():
+    df = pd.DataFrame({'sample': ['E01_01_S1_R3'], 'fraction_positive': [12.5]})
+    key = lab_figures.render_key('fig_07', df, {'brain': 349})
+    assert key == lab_figures.render_key('fig_07', df.copy(), {'brain': 349})
+    assert key != lab_figures.render_key('fig_08', df, {'brain': 349})
+    assert key != lab_figures.render_key('fig_07', df.assign(fraction_positive=13.0), {'brain': 349})
+    assert key != lab_figures.render_key('fig_07', df.rename(columns={'sample': 's'}), {'brain': 349})
+    assert key != lab_figures.render_key('fig_07', df, {'brain': 357})
+    assert key != lab_figures.render_key('fig_07', None, {'brain': 349})
+
+
+def test_saved_figure_is_up_to_date_only_for_its_key(tmp_path, monkeypatch):
+    import matplotlib.pyplot as plt
+
+    monkeypatch.setattr(lab_figures, 'FORCE_REGENERATE', False)
+    assert not lab_figures.is_up_to_date(tmp_path, 'fig.png', 'k1')
+
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    lab_figures.save_fig(fig, tmp_path, 'fig.png', key='k1')
+    assert lab_figures.is_up_to_date(tmp_path, 'fig.png', 'k1')
+    assert not lab_figures.is_up_to_date(tmp_path, 'fig.png', 'k2')
+
+    monkeypatch.setattr(lab_figures, 'FORCE_REGENERATE', True)
+    assert not lab_figures.is_up_to_date(tmp_path, 'fig.png', 'k1')
+
+
+def test_region_count_matrix_skips_blank_and_sums_repeated_acronyms():
+    brain_counts = {
+        349: pd.DataFrame({'region_acronym': ['MOp', 'GRN', None, 'MOp'],
+                           'cell_count': [10, 5, 7, 2]}),
+        357: pd.DataFrame({'region_acronym': ['GRN', 'RN'],
+                           'cell_count': [3, None]}),
+    }
+    regions, counts = lab_figures._region_count_matrix(brain_counts, [349, 357])
+    assert regions == ['GRN', 'MOp', 'RN']
+    assert counts.tolist() == [[5, 3], [12, 0], [0, 0]]
@@ -0,0 +1,141 @@
+"""
+Tests for the memoized summaries in mousedb.stats.
+
+Each test reads a summary once so it is cached, changes the data through one
+of the write paths, and checks the next read reflects the change. Sessions
+come from a sessionmaker with the cache events registered, as Database's do.
+"""
+
+import sqlite3
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, delete, update
+from sqlalchemy.orm import sessionmaker
+
+from mousedb import stats
+from mousedb.backfill import backfill_phases
+from mousedb.schema import Base, Cohort, PelletScore, Project, Subject
+
+
+SUBJECT = 'CNT_01_01'
+
+
+def _add_scores(session, session_date, n, score=2):
+    for pellet in range(1, n + 1):
+        session.add(PelletScore(subject_id=SUBJECT, session_date=session_date, tray_type='P',
+                                tray_number=1, pellet_number=pellet, score=score))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A file-backed database with one subject and 20 scored pellets."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'connectome.db'}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(Project(project_code='CNT', project_name='Connectome'))
+        session.add(Cohort(cohort_id='CNT_01', project_code='CNT', start_date=date(2025, 1, 1)))
+        session.add(Subject(subject_id=SUBJECT, cohort_id='CNT_01'))
+        _add_scores(session, date(2025, 1, 2), 20)
+        session.commit()
+    stats.clear_stats_cache()
+    yield engine
+    stats.clear_stats_cache()
+    engine.dispose()
+
+
+@pytest.fixture
+def make_session(engine):
+    """Session factory bound to engine, with the cache events registered."""
+    factory = sessionmaker(bind=engine)
+    stats.register_cache_events(factory)
+    return factory
+
+
+def _pellets(session):
+    return stats.calculate_subject_summary(session, SUBJECT).total_pellets_scored
+
+
+def test_repeated_reads_are_memoized(make_session):
+    with make_session() as session:
+        first = stats.calculate_subject_summary(session, SUBJECT)
+        assert stats.calculate_subject_summary(session, SUBJECT) is first
+        assert first.total_pellets_scored == 20
+
+
+def test_orm_insert_invalidates(make_session):
+    with make_session() as session:
+        assert _pellets(session) == 20
+        _add_scores(session, date(2025, 1, 3), 5)
+        session.flush()
+        assert _pellets(session) == 25
+
+
+def test_uncommitted_writes_stay_in_their_session(make_session, monkeypatch):
+    # Only the session events, as for a database without PRAGMA data_version
+    monkeypatch.setattr(stats, '_sqlite_data_version', lambda engine: None)
+    with make_session() as writer:
+        _add_scores(writer, date(2025, 1, 3), 5)
+        writer.flush()
+        assert _pellets(writer) == 25
+        with make_session() as reader:
+            assert _pellets(reader) == 20
+        writer.commit()
+    with make_session() as reader:
+        assert _pellets(reader) == 25
+
+
+def test_bulk_update_and_delete_invalidate(make_session):
+    with make_session() as session:
+        assert stats.calculate_subject_summary(session, SUBJECT).overall_retrieved_pct == 100
+        session.execute(update(PelletScore).values(score=0))
+        assert stats.calculate_subject_summary(session, SUBJECT).overall_retrieved_pct == 0
+        session.execute(delete(PelletScore).where(PelletScore.pellet_number > 10))
+        assert _pellets(session) == 10
+
+
+def test_rollback_invalidates(make_session):
+    with make_session() as session:
+        _add_scores(session, date(2025, 1, 3), 5)
+        session.flush()
+        assert _pellets(session) == 25
+        session.rollback()
+        assert _pellets(session) == 20
+
+
+def test_commit_from_another_connection_invalidates(make_session, tmp_path):
+    with make_session() as session:
+        assert _pellets(session) == 20
+        assert stats.get_cohort_overview(session, 'CNT_01')['num_subjects'] == 1
+
+    # e.g. mousereach-sync, writing with raw SQL from another process
+    conn = sqlite3.connect(tmp_path / 'connectome.db')
+    conn.execute("DELETE FROM pellet_scores WHERE pellet_number > 15")
+    conn.execute("INSERT INTO subjects (subject_id, cohort_id) VALUES ('CNT_01_02', 'CNT_01')")
+    conn.commit()
+    conn.close()
+
+    with make_session() as session:
+        assert _pellets(session) == 15
+        assert stats.get_cohort_overview(session, 'CNT_01')['num_subjects'] == 2
+
+
+def test_backfill_invalidates(make_session, engine):
+    with make_session() as session:
+        summary = stats.calculate_subject_summary(session, SUBJECT)
+        assert summary.sessions[0].test_phase is None
+
+    backfill_phases(SimpleNamespace(engine=engine))
+
+    with make_session() as session:
+        summary = stats.calculate_subject_summary(session, SUBJECT)
+        assert summary.sessions[0].test_phase is not None
+
+
+def test_dispose_closes_the_data_version_connection(make_session, engine):
+    with make_session() as session:
+        assert _pellets(session) == 20
+    assert engine in stats._data_version_conns
+    engine.dispose()
+    assert engine not in stats._data_version_conns
@@ -0,0 +1,182 @@
+"""Tests for mousedb.utils.stats_organizer.
+
+Builds small tracking sheets in a temp directory and checks the unified
+tray-summary file written from the per-cohort level2 outputs, and the
+pellet-count cache used to pick between copies of a cohort's workbook.
+"""
+
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mousedb.utils import stats_organizer
+
+
+def _write_tracking_sheet(path, n_animals=2, n_days=3, seed=0):
+    """Write a minimal 3b_Manual_Tray sheet, as CSV or (for .xlsx) a workbook."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for day in range(n_days):
+        for animal in range(n_animals):
+            for tray in ['P1', 'P2', 'F1']:
+                row = {
+                    'Date': f'2025-01-{day + 1:02d}',
+                    'Animal': f'CNT_01_{animal:02d}',
+                    'Sex': 'MF'[animal % 2],
+                    'Weight': 20.0 + animal,
+                    'Weight %': 95.0,
+                    'Test_Phase': 'Training',
+                    'Tray Type/Number': tray,
+                }
+                row.update({p: rng.choice([0, 1, 2]) for p in range(1, 21)})
+                rows.append(row)
+    if path.suffix == '.xlsx':
+        pd.DataFrame(rows).to_excel(path, sheet_name='3b_Manual_Tray', index=False)
+    else:
+        pd.DataFrame(rows).to_csv(path, index=False)
+
+
+@pytest.fixture
+def cohort_dir(tmp_path, capsys):
+    """A reorganized/ directory holding one cohort's level2 summaries."""
+    source = tmp_path / 'Connectome_01_Animal_Tracking.csv'
+    _write_tracking_sheet(source)
+    output_dir = tmp_path / 'generated' / 'reorganized'
+    output_dir.mkdir(parents=True)
+    stats_organizer.reorganize_file(str(source), str(output_dir))
+    return output_dir
+
+
+def test_level2_counts_are_int64(tmp_path, monkeypatch, capsys):
+    written = {}
+    write_csv = stats_organizer._write_csv
+
+    def capture(df, path):
+        if str(path).endswith('_level2_tray_summaries.csv'):
+            written['level2'] = df
+        write_csv(df, path)
+
+    monkeypatch.setattr(stats_organizer, '_write_csv', capture)
+    source = tmp_path / 'Connectome_01_Animal_Tracking.csv'
+    _write_tracking_sheet(source)
+    stats_organizer.reorganize_file(str(source), str(tmp_path))
+    level2 = written['level2']
+    for col in ['Miss_Count', 'Displaced_Count', 'Retrieved_Count', 'Total_Pellets']:
+        assert level2[col].dtype == np.int64
+    assert (level2['Total_Pellets'] * 100).max() == 2000
+
+
+def test_written_csvs_read_back_like_to_csv(tmp_path, monkeypatch, capsys):
+    written = {}
+    write_csv = stats_organizer._write_csv
+
+    def capture(df, path):
+        written[path] = df
+        write_csv(df, path)
+
+    monkeypatch.setattr(stats_organizer, '_write_csv', capture)
+    source = tmp_path / 'Connectome_01_Animal_Tracking.csv'
+    _write_tracking_sheet(source)  # whole-number weights, e.g. 20.0
+    sheet = pd.read_csv(source)
+    sheet.loc[0, 'Tray Type/Number'] = 'X'  # unparseable tray: NaN difficulty and repetition
+    sheet.loc[1, 'Animal'] = 'CNT_01_00, left'  # needs quoting
+    sheet.to_csv(source, index=False)
+    stats_organizer.reorganize_file(str(source), str(tmp_path))
+
+    assert len(written) == 4
+    for path, df in written.items():
+        expected = pd.read_csv(io.StringIO(df.to_csv(index=False)))
+        pd.testing.assert_frame_equal(pd.read_csv(path), expected)
+    level2 = pd.read_csv(tmp_path / 'Connectome_01_Animal_Tracking_level2_tray_summaries.csv')
+    assert level2['Weight'].dtype == np.float64
+
+
+def test_reorganize_results_hold_only_paths(tmp_path, capsys):
+    for cohort in (1, 2):
+        _write_tracking_sheet(tmp_path / f'Connectome_{cohort:02d}_Animal_Tracking.xlsx', seed=cohort)
+    output_dir = tmp_path / 'reorganized'
+    output_dir.mkdir()
+    outputs = stats_organizer.reorganize_file(
+        str(tmp_path / 'Connectome_01_Animal_Tracking.xlsx'), str(output_dir))
+    assert set(outputs) == {'level1', 'level2', 'level3', 'fatigue'}
+    results = stats_organizer.reorganize_directory(tmp_path, output_dir=str(output_dir))
+    for info in results.values():
+        assert all(isinstance(path, str) for path in info['outputs'].values())
+
+
+def test_unified_parquet_matches_csv_schema(cohort_dir, capsys):
+    stats_organizer._create_unified_file(cohort_dir)
+    unified_csv = cohort_dir.parent / 'all_cohorts_tray_summaries.csv'
+    from_parquet = pd.read_parquet(unified_csv.with_suffix('.parquet'))
+    from_csv = pd.read_csv(unified_csv)
+    pd.testing.assert_frame_equal(from_parquet, from_csv)
+
+
+def test_unified_frame_is_normalised_without_rereading_the_csv(tmp_path, monkeypatch, capsys):
+    output_dir = tmp_path / 'generated' / 'reorganized'
+    output_dir.mkdir(parents=True)
+    for cohort in (1, 2):
+        source = tmp_path / f'Connectome_{cohort:02d}_Animal_Tracking.csv'
+        _write_tracking_sheet(source, seed=cohort)
+        sheet = pd.read_csv(source)
+        sheet.loc[0, 'Tray Type/Number'] = 'X'  # NaN difficulty and repetition
+        if cohort == 2:
+            sheet = sheet.drop(columns=['Sex'])
+        sheet.to_csv(source, index=False)
+        stats_organizer.reorganize_file(str(source), str(output_dir))
+    frames = [stats_organizer._read_level2_file(path)
+              for path in stats_organizer._latest_level2_files(output_dir).values()]
+
+    unified_csv = output_dir.parent / 'all_cohorts_tray_summaries.csv'
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: pytest.fail('CSV re-read'))
+    stats_organizer._write_unified_file(frames, output_dir)
+    monkeypatch.setattr(pd, 'read_csv', read_csv)
+
+    from_parquet = pd.read_parquet(unified_csv.with_suffix('.parquet'))
+    pd.testing.assert_frame_equal(from_parquet, pd.read_csv(unified_csv))
+    assert from_parquet['Tray_Repetition'].dtype == np.float64
+
+
+def test_unified_file_keeps_cohorts_that_fail_to_reorganize(tmp_path, capsys):
+    for cohort in (1, 2):
+        _write_tracking_sheet(tmp_path / f'Connectome_{cohort:02d}_Animal_Tracking.xlsx', seed=cohort)
+    output_dir = tmp_path / 'generated' / 'reorganized'
+    stats_organizer.reorganize_all_cohorts(tmp_path, output_dir)
+    unified_csv = output_dir.parent / 'all_cohorts_tray_summaries.csv'
+    before = pd.read_csv(unified_csv)
+    assert sorted(before['Cohort'].unique()) == ['CNT_01', 'CNT_02']
+
+    # Cohort 2's workbook can no longer be read; its previous level2 file is used
+    (tmp_path / 'Connectome_02_Animal_Tracking.xlsx').write_bytes(b'not a workbook')
+    stats_organizer.reorganize_all_cohorts(tmp_path, output_dir)
+    after = pd.read_csv(unified_csv)
+    pd.testing.assert_frame_equal(after, before)
+
+
+def test_pellet_counts_are_cached_until_the_workbook_changes(tmp_path, capsys):
+    full = tmp_path / 'Connectome_01_Animal_Tracking.xlsx'
+    partial = tmp_path / 'Connectome_01_Animal_Tracking (1).xlsx'
+    _write_tracking_sheet(full, n_days=3)
+    _write_tracking_sheet(partial, n_days=1)
+    assert stats_organizer.discover_tracking_files(tmp_path) == {1: full}
+
+    cache_path = tmp_path / 'generated' / stats_organizer._PELLET_COUNT_CACHE_NAME
+    cache = json.loads(cache_path.read_text())
+    counts = {Path(k).name: v['count'] for k, v in cache.items()}
+    assert counts == {full.name: 360, partial.name: 120}
+
+    # A stored count is trusted while the file's mtime and size match
+    cache[str(partial.resolve())]['count'] = 1000
+    cache_path.write_text(json.dumps(cache))
+    assert stats_organizer.discover_tracking_files(tmp_path) == {1: partial}
+
+    # Rewriting the workbook invalidates its entry
+    _write_tracking_sheet(partial, n_days=2)
+    assert stats_organizer.discover_tracking_files(tmp_path) == {1: full}
+    cache = json.loads(cache_path.read_text())
+    assert cache[str(partial.resolve())]['count'] == 240